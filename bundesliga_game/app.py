@@ -2,28 +2,74 @@
 
 import streamlit as st
 import pandas as pd
-import joblib
 import os
-import plotly.graph_objects as go
-from utils.gsheets import init_gsheets, load_scoreboard, save_scoreboard
-from utils.helpers import get_base64_encoded_image, get_team_logo_path, local_css, create_radar_chart
+import time
+import functools
+from utils.scoreboard import create_scoreboard_backend, append_score
+from utils.helpers import get_cached_image, get_logo_path, get_team_logo, get_team_logo_path, logo_cache, local_css, compute_radar_matrix, radar_figure, RADAR_COLUMNS
+from utils.assets import get_mime_type
+from utils.compiled_model import CompiledModel
+from utils.contributions import compute_contributions, top_contributions, feature_label, format_feature_value
+from utils.evaluation import is_evaluation_current, load_evaluation, slice_frame
+from utils.predictions import precompute_predictions, lookup_prediction
+from utils.resources import registry
+from utils.similar_matches import SimilarMatchIndex
+from utils.match_store import load_matches
+from utils.schedule import ROUNDS_PER_GAME, build_strata, draw_schedule
+from utils.prefetch import Prefetcher
+from utils.metrics import ENABLED as metrics_enabled, metrics, timed, phase
+from utils.game_state import GameState, Outcome, SCORE_MESSAGES, USER_WIN, MODEL_WIN, REAL_WIN, round_outcome, win_label
 
 # Set page configuration to wide layout
 st.set_page_config(layout="wide")
 # Apply custom CSS
 local_css()
+# Collect this rerun's phase timings for the debug panel
+if metrics_enabled:
+    metrics.start_rerun()
+
+# Paths of the data files
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(script_dir, 'data', 'bundesliga_matches.csv')
+MODEL_PATH = os.path.join(script_dir, 'data', 'best_lr_model.pkl')
+COMPILED_MODEL_PATH = os.path.join(script_dir, 'data', 'compiled_lr_model.json')
+STORE_DIR = os.path.join(script_dir, 'data', 'match_store')
+EVALUATION_PATH = os.path.join(script_dir, 'data', 'model_evaluation.json')
 
+# Define model features
+model_features = [
+    "team_overall", "team_attack", "team_midfield", "team_defense",
+    "opponent_overall", "opponent_attack", "opponent_midfield", "opponent_defense",
+    "gf_last_4_games", "ga_last_4_games", "xg_last_4_games", "xga_last_4_games",
+    "avg_points_last_4_games", "sh_last_4_games", "sot_last_4_games", "poss_last_4_games",
+    "opponent_gf_last_4_games", "opponent_ga_last_4_games", "opponent_xga_last_4_games",
+    "opponent_avg_points_last_4_games", "team_salary", "opponent_team_salary", "hour",
+    "venue", "day", "home_team_formation", "away_team_formation", "captain", "opponent_captain", "referee"
+]
+
+# Columns used by the radar chart
+radar_columns = [column for columns in RADAR_COLUMNS.values() for column in columns]
+
+# Columns shown on the game and results pages
+display_columns = ["team", "opponent", "venue", "date", "referee", "round", "result"]
 
+# Real results as shown in the similar matches panel
+result_labels = {'W': 'Win', 'D': 'Draw', 'L': 'Loss'}
 
+# Spread each game's matches over the values of this column, e.g. 'result'
+# or 'season'; None draws the matches uniformly
+schedule_stratify_by = None
+
+# Only these columns are loaded from the match store
+app_columns = list(dict.fromkeys(model_features + radar_columns + display_columns))
+
+@timed('load_resources')
 def load_resources():
     """
     Load the Bundesliga match data and the trained model.
     """
     try:
-        # Get the absolute path of the CSV file
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(script_dir, 'data', 'bundesliga_matches.csv')
-        df = pd.read_csv(file_path)
+        df = load_matches(DATA_PATH, STORE_DIR, columns=app_columns)
     except FileNotFoundError:
         st.error("Data file 'bundesliga_matches.csv' not found in 'data/' directory.")
         st.stop()
@@ -32,8 +78,12 @@ def load_resources():
         st.stop()
 
     try:
-        model_path = os.path.join(script_dir, 'data', 'best_lr_model.pkl')
-        model = joblib.load(model_path)
+        # The compiled scorer needs only NumPy; fall back to the sklearn pipeline
+        # until `python -m utils.compiled_model` has exported the current pickle
+        model = CompiledModel.load(COMPILED_MODEL_PATH) if os.path.exists(COMPILED_MODEL_PATH) else None
+        if model is None or not model.is_exported_from(MODEL_PATH):
+            import joblib
+            model = joblib.load(MODEL_PATH)
     except FileNotFoundError:
         st.error("Model file 'best_lr_model.pkl' not found in 'data/' directory.")
         st.stop()
@@ -43,77 +93,118 @@ def load_resources():
     
     return df, model
 
+def build_resources():
+    """
+    Load the data and model and derive everything the game needs from them.
+    """
+    df, model = load_resources()
+
+    # Calculate min and max salaries for normalization
+    min_salary = df[['team_salary', 'opponent_team_salary']].min().min()
+    max_salary = df[['team_salary', 'opponent_team_salary']].max().max()
+
+    # Precompute the model predictions for every match
+    model_labels, model_win_probabilities = precompute_predictions(df, model, model_features)
+
+    # Split every match's model decision into per-feature contributions
+    contribution_features, contributions = compute_contributions(model, df)
+
+    # Index the matches on their standardized radar and model features
+    similar_matches = SimilarMatchIndex(df, list(dict.fromkeys(radar_columns + model_features)))
+
+    # Normalize the radar chart values for every match
+    team_radar, opponent_radar = compute_radar_matrix(df, min_salary, max_salary)
+
+    # Radar charts are only built once per match and shared across sessions
+    @functools.lru_cache(maxsize=256)
+    def get_radar_figure(row):
+        return radar_figure(team_radar[row], opponent_radar[row], df['team'].iloc[row], df['opponent'].iloc[row])
+
+    return {
+        'df': df,
+        'model': model,
+        'min_salary': min_salary,
+        'max_salary': max_salary,
+        'model_labels': model_labels,
+        'model_win_probabilities': model_win_probabilities,
+        'contribution_features': contribution_features,
+        'contributions': contributions,
+        'get_radar_figure': get_radar_figure,
+        'similar_matches': similar_matches,
+        'schedule_strata': build_strata(df, schedule_stratify_by) if schedule_stratify_by else None,
+        'prefetcher': Prefetcher(),
+    }
+
 # Initialize session state
 def initialize_session_state():
-    if 'game_started' not in st.session_state:
-        st.session_state.game_started = False
-        st.session_state.current_game_finished = False
-        st.session_state.user_score = 0
-        st.session_state.username = ""
-        st.session_state.random_game = None
-        st.session_state.round_count = 0  # Add a counter for rounds
-        st.session_state.user_prediction = None  # Store user prediction
-    if 'score_added' not in st.session_state:
-        st.session_state.score_added = False  # Flag to prevent duplicate entries
-
-# Function to select a random game
-def get_random_game(df):
-    return df.sample(1).iloc[0]
+    if 'game' not in st.session_state:
+        st.session_state.game = GameState()
+
+# Row position of the current round's match
+def current_row():
+    return st.session_state.game.current_row()
+
+# Match data of the current round, resolved from the shared data
+def current_match():
+    return df.iloc[current_row()]
+
+# Everything the game page needs to render a match
+def prepare_round(row):
+    random_game = df.iloc[row]
+    return {
+        'match': random_game,
+        'team_logo': get_team_logo(random_game['team']),
+        'team_logo_mime': get_mime_type(get_team_logo_path(random_game['team'])),
+        'opponent_logo': get_team_logo(random_game['opponent']),
+        'opponent_logo_mime': get_mime_type(get_team_logo_path(random_game['opponent'])),
+        'model_prediction': lookup_prediction(model_labels, model_win_probabilities, row)[0],
+        'figure': get_radar_figure(row),
+        'similar_rows': similar_matches.query(row)[0],
+    }
+
+# Prepare a round in the background before the player gets to it
+def prefetch_round(round_number):
+    schedule = st.session_state.game.schedule
+    if round_number <= len(schedule):
+        row = schedule[round_number - 1]
+        prefetcher.submit(row, prepare_round, row)
 
 # Start the game
 def start_game(username, df):
-    st.session_state.username = username
-    st.session_state.random_game = get_random_game(df)
-    st.session_state.game_started = True
-    st.session_state.current_game_finished = False
-    st.session_state.round_count = 1  # Start with the first round
-    st.session_state.score_added = False  # Reset score_added flag
+    st.session_state.game = GameState(
+        username=username,
+        game_started=True,
+        round_count=1,  # Start with the first round
+        schedule=tuple(draw_schedule(len(df), strata=schedule_strata))
+    )
+    prefetch_round(1)
 
+@timed('evaluate_prediction')
 def evaluate_prediction(user_choice, df, model):
-    st.session_state.user_prediction = user_choice
-    random_game = st.session_state.random_game
-    model_input_df = pd.DataFrame([random_game[model_features]], columns=model_features)
+    game = st.session_state.game
+    random_game = current_match()
 
-    # Get model prediction and extract the scalar value
-    model_prediction = model.predict(model_input_df)[0]
+    # Look up the precomputed model prediction for this match
+    model_prediction, _ = lookup_prediction(model_labels, model_win_probabilities, current_row())
 
     real_result = random_game['result']  # 'W' for Win, 'L' for Loss, 'D' for Draw
 
-    # Convert model prediction to a label
-    model_prediction_label = 'Win' if model_prediction == 1 else 'Not Win'
-    real_result_label = 'Win' if real_result == 'W' else 'Not Win'  # Treat 'L' and 'D' as 'Not Win'
-
-    # Store predictions in session state
-    st.session_state.model_prediction_label = model_prediction_label
-    st.session_state.user_prediction_label = user_choice
-    st.session_state.result_real_result = f"The real result: Team **{random_game['team']}** did **{real_result_label}** the game!"
-
-    # Determine correctness
-    user_correct = (st.session_state.user_prediction_label == real_result_label)
-    model_correct = (st.session_state.model_prediction_label == real_result_label)
-
-    # Update score logic and messages
-    if user_correct and not model_correct:
-        st.session_state.user_score += 1
-        st.session_state.result_score_message = "Congratulations! You predicted correctly and the model was wrong. You get 1 point!"
+    # Record the round (treat 'L' and 'D' as 'Not Win') and update the score
+    outcome = game.record_round(
+        user_win=(user_choice == 'Win'),
+        model_win=(model_prediction == 1),
+        real_win=(real_result == 'W')
+    )
+    if outcome == Outcome.USER_ONLY_CORRECT:
         st.balloons()
-    elif not user_correct and model_correct:
-        st.session_state.user_score -= 1
-        st.session_state.result_score_message = "The model predicted correctly, but you were wrong. You lose 1 point."
-    elif user_correct and model_correct:
-        st.session_state.result_score_message = "Both you and the model predicted correctly. No points awarded."
-    else:
-        st.session_state.result_score_message = "Both you and the model predicted incorrectly. No points awarded."
-
-    # Mark the current game as finished
-    st.session_state.current_game_finished = True
 
 # Callback functions for buttons
 def next_match():
-    st.session_state.random_game = get_random_game(df)
-    st.session_state.current_game_finished = False
-    st.session_state.round_count += 1
-    st.session_state.score_added = False  # Reset score_added flag for the new round
+    game = st.session_state.game
+    game.clicked_at = time.perf_counter()
+    game.current_game_finished = False
+    game.round_count += 1
+    game.score_added = False  # Reset score_added flag for the new round
 
 def predict_win():
     evaluate_prediction('Win', df, model)
@@ -122,17 +213,17 @@ def predict_not_win():
     evaluate_prediction('Not Win', df, model)
 
 # Helper function to display team info (name and logo)
-def display_team_info(team_name):
-    logo_path = get_team_logo_path(team_name)
-    logo_image = get_base64_encoded_image(logo_path)
+def display_team_info(team_name, logo_image, mime_type):
     if logo_image:
         st.markdown(f"""
             <div style="text-align: center;">
                 <h2>{team_name}</h2>
-                <img class="team-logo" src="data:image/png;base64,{logo_image}" alt="{team_name} Logo">
+                <img class="team-logo" src="data:{mime_type};base64,{logo_image}" alt="{team_name} Logo">
             </div>
         """, unsafe_allow_html=True)
     else:
+        # Logos are encoded on the prefetch threads, so the warning is shown here
+        st.warning(f"Image not found at path: {get_team_logo_path(team_name)}")
         st.markdown(f"""
             <div style="text-align: center;">
                 <h2>{team_name}</h2>
@@ -141,12 +232,10 @@ def display_team_info(team_name):
         """, unsafe_allow_html=True)
 
 # Display landing page content
-def landing_page(scoreboard):
-    # Get the directory where the script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Adjust the file extension and MIME type
-    logo_path = os.path.join(script_dir, 'logos', 'Bundesliga Logo.gif')
-    mime_type = 'image/gif'  # Set MIME type for GIF
+def landing_page(backend):
+    # Use the display-sized variant of the logo and its MIME type
+    logo_path = get_logo_path('Bundesliga Logo', 'Bundesliga Logo.gif')
+    mime_type = get_mime_type(logo_path)
 
     # CSS to center the landing page content
     st.markdown(
@@ -166,7 +255,7 @@ def landing_page(scoreboard):
     st.markdown('<div class="landing-page">', unsafe_allow_html=True)
 
     # Display the Bundesliga logo at the top and center it
-    logo_image = get_base64_encoded_image(logo_path)
+    logo_image = get_cached_image('Bundesliga Logo', logo_path)
     if logo_image:
         st.markdown(
             f"""
@@ -177,6 +266,7 @@ def landing_page(scoreboard):
             unsafe_allow_html=True
         )
     else:
+        st.warning(f"Image not found at path: {logo_path}")
         st.markdown("<p style='text-align: center;'>Bundesliga Logo not found.</p>", unsafe_allow_html=True)
 
     # Center the title
@@ -214,13 +304,13 @@ def landing_page(scoreboard):
     # Username input with placeholder
     username = st.text_input("Enter your username:", key='username_input', placeholder='Type your username here...')
 
+    display_model_evaluation()
+
     # Display 'Start the Game' button and handle click
     if st.button("Start the Game", type='primary'):
         if username == "":
             st.error("You must enter a username to start the game.")
-        elif 'Username' not in scoreboard.columns:
-            st.error("Scoreboard is improperly configured. Please contact the administrator.")
-        elif username in scoreboard['Username'].values:
+        elif backend.has_user(username):
             st.warning(f"The username '{username}' is already taken. Please choose another one.")
         else:
             start_game(username, df)
@@ -228,24 +318,76 @@ def landing_page(scoreboard):
     # End the landing page container
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Show how the model did on all past matches, from `python -m utils.evaluation`
+def load_current_evaluation():
+    """
+    Load the saved evaluation, or None if there is none or it was computed
+    on other versions of the data or model files.
+    """
+    evaluation = load_evaluation(EVALUATION_PATH)
+    if evaluation is None or not is_evaluation_current(evaluation, DATA_PATH, MODEL_PATH):
+        return None
+    return evaluation
+
+def display_model_evaluation():
+    # Checked again whenever the evaluation, the data or the model file changes
+    evaluation = registry.get('evaluation', [EVALUATION_PATH, DATA_PATH, MODEL_PATH], load_current_evaluation)
+    if evaluation is None:
+        return
+    overall = evaluation['overall']
+    with st.expander("How good is the model?"):
+        st.write(
+            f"On all {overall['matches']} past matches the model picks the right outcome "
+            f"**{overall['accuracy']:.1%}** of the time (log loss {overall['log_loss']:.3f})."
+        )
+        st.dataframe(slice_frame(evaluation, 'season'), hide_index=True)
+
+# Show the phase timings of this rerun and of the whole process
+def display_metrics_panel():
+    with st.expander("Timings", expanded=True):
+        st.write("This rerun:")
+        st.dataframe(
+            pd.DataFrame(
+                [(name, round(seconds * 1000, 2)) for name, seconds in metrics.rerun_timings()],
+                columns=['Phase', 'ms']
+            ),
+            hide_index=True
+        )
+        st.write("This process:")
+        st.dataframe(pd.DataFrame.from_dict(metrics.stats(), orient='index'))
+        st.write("Prefetched rounds:")
+        st.dataframe(pd.DataFrame([prefetcher.stats()]), hide_index=True)
+        st.write("Shared resources:")
+        registry_stats = registry.stats()
+        registry_stats['cached'] = ', '.join(registry_stats['cached'])
+        st.dataframe(pd.DataFrame([registry_stats]), hide_index=True)
+
 # Display game content
 def game_page():
-    st.write(f"Round {st.session_state.round_count} of 5")
-
-    random_game = st.session_state.random_game
+    game = st.session_state.game
+    st.write(f"Round {game.round_count} of {ROUNDS_PER_GAME}")
 
-    if st.session_state.current_game_finished:
+    if game.current_game_finished:
         display_results()
-        if st.session_state.round_count < 5:
+        if game.round_count < ROUNDS_PER_GAME:
             st.button("Next Match", on_click=next_match)
         else:
             display_final_results()
     else:
-        # Display game stats and prediction buttons
-        display_game_stats(random_game)
+        # Display game stats and prediction buttons, prepared in the background if possible
+        row = current_row()
+        display_game_stats(prefetcher.get(row, prepare_round, row))
+
+        # Record the time from the "Next Match" click to the end of rendering
+        if game.clicked_at:
+            if metrics_enabled:
+                metrics.record('next_match_click', time.perf_counter() - game.clicked_at)
+            game.clicked_at = 0.0
 
 # Display game statistics
-def display_game_stats(random_game):
+def display_game_stats(prepared):
+    random_game = prepared['match']
+
     # Title for the match
     st.subheader(f"{random_game['team']} vs {random_game['opponent']}")
 
@@ -254,9 +396,9 @@ def display_game_stats(random_game):
 
     # Left Column - Team A Info
     with col1:
-        display_team_info(random_game['team'])
+        display_team_info(random_game['team'], prepared['team_logo'], prepared['team_logo_mime'])
         # Add prediction button under team logo, centered
-        if not st.session_state.current_game_finished:
+        if not st.session_state.game.current_game_finished:
             col1_empty1, col1_button, col1_empty2 = st.columns([1, 2, 1])
             with col1_button:
                 st.button(
@@ -284,9 +426,9 @@ def display_game_stats(random_game):
 
     # Right Column - Opponent Info
     with col3:
-        display_team_info(random_game['opponent'])
+        display_team_info(random_game['opponent'], prepared['opponent_logo'], prepared['opponent_logo_mime'])
         # Add prediction button under opponent logo, centered
-        if not st.session_state.current_game_finished:
+        if not st.session_state.game.current_game_finished:
             col3_empty1, col3_button, col3_empty2 = st.columns([1, 2, 1])
             with col3_button:
                 st.button(
@@ -295,51 +437,37 @@ def display_game_stats(random_game):
                     key='predict_not_win_button'
                 )
 
-    # Prepare stats for the radar chart
-    team_a_stats = {
-        "Overall": random_game["team_overall"],
-        "Attack": random_game["team_attack"],
-        "Midfield": random_game["team_midfield"],
-        "Defense": random_game["team_defense"],
-        "avg Goals Scored last 4 games": random_game["gf_last_4_games"],
-        "avg xG last 4 games": random_game["xg_last_4_games"],
-        "avg Possession last 4 games": random_game["poss_last_4_games"],
-        "Salary Level": random_game["team_salary"]
-    }
-
-    opponent_stats = {
-        "Overall": random_game["opponent_overall"],
-        "Attack": random_game["opponent_attack"],
-        "Midfield": random_game["opponent_midfield"],
-        "Defense": random_game["opponent_defense"],
-        "avg Goals Scored last 4 games": random_game["opponent_gf_last_4_games"],
-        "avg xG last 4 games": random_game["opponent_xg_last_4_games"],
-        "avg Possession last 4 games": random_game["opponent_poss_last_4_games"],
-        "Salary Level": random_game["opponent_team_salary"]
-    }
-
-    # Create and display the combined radar chart
-    fig = create_radar_chart(
-        team_a_stats,
-        opponent_stats,
-        random_game['team'],
-        random_game['opponent'],
-        min_salary,
-        max_salary
-    )
+    # Display the cached radar chart for this match
+    fig = prepared['figure']
     st.plotly_chart(fig, use_container_width=True)
 
+    # Matches with the closest stats, with their real results
+    display_similar_matches(prepared['similar_rows'])
+
+# Show the past matches closest to the current one
+def display_similar_matches(rows):
+    similar = df.iloc[rows]
+    with st.expander("Similar past matches"):
+        st.table(pd.DataFrame({
+            'Date': similar['date'].astype(str).to_numpy(),
+            'Team': similar['team'].to_numpy(),
+            'Opponent': similar['opponent'].to_numpy(),
+            'Venue': similar['venue'].to_numpy(),
+            'Result': similar['result'].map(result_labels).fillna(similar['result']).to_numpy(),
+        }).set_index('Date'))
+
 # Display results after a prediction
 def display_results():
     st.subheader("Results")
     
     # Display match information
-    if st.session_state.random_game is not None:
-        team_a = st.session_state.random_game['team']
-        team_b = st.session_state.random_game['opponent']
-        st.markdown(f"### Match: **{team_a}** vs **{team_b}**")
-    else:
-        st.markdown("### Match information not available.")
+    game = st.session_state.game
+    random_game = current_match()
+    st.markdown(f"### Match: **{random_game['team']}** vs **{random_game['opponent']}**")
+
+    # Render the last round from its code
+    code = game.last_round()
+    outcome = round_outcome(code)
     
     # Create columns for better layout
     col1, col2 = st.columns([1, 1])
@@ -347,7 +475,7 @@ def display_results():
     # Column 1: User's Prediction
     with col1:
         st.markdown("### Your Prediction:")
-        if st.session_state.user_prediction_label == 'Win':
+        if code & USER_WIN:
             st.markdown("<h3 style='color: green;'>Win</h3>", unsafe_allow_html=True)
         else:
             st.markdown("<h3 style='color: red;'>Not Win</h3>", unsafe_allow_html=True)
@@ -355,97 +483,115 @@ def display_results():
     # Column 2: Model's Prediction
     with col2:
         st.markdown("### Model's Prediction:")
-        if st.session_state.model_prediction_label == 'Win':
+        if code & MODEL_WIN:
             st.markdown("<h3 style='color: blue;'>Win</h3>", unsafe_allow_html=True)
         else:
             st.markdown("<h3 style='color: orange;'>Not Win</h3>", unsafe_allow_html=True)
 
+    # Features that moved the model's decision the most
+    display_contributions(current_row(), random_game)
+
     # Real Game Result
     st.markdown("### Real Game Result:")
-    st.write(st.session_state.result_real_result)
+    st.write(f"The real result: Team **{random_game['team']}** did **{win_label(code & REAL_WIN)}** the game!")
 
     # Use message functions for feedback
-    if "Congratulations" in st.session_state.result_score_message:
-        st.success(st.session_state.result_score_message)
-    elif "lose 1 point" in st.session_state.result_score_message:
-        st.error(st.session_state.result_score_message)
+    if outcome == Outcome.USER_ONLY_CORRECT:
+        st.success(SCORE_MESSAGES[outcome])
+    elif outcome == Outcome.MODEL_ONLY_CORRECT:
+        st.error(SCORE_MESSAGES[outcome])
     else:
-        st.info(st.session_state.result_score_message)
+        st.info(SCORE_MESSAGES[outcome])
 
     # Correctly display the current score (no recalculation or overwriting)
-    st.markdown(f"### Your Current Score: **{st.session_state.user_score}**")
+    st.markdown(f"### Your Current Score: **{game.user_score}**")
+
+    # Prepare the next round while the player reads the results
+    prefetch_round(game.round_count + 1)
+
+# Show the precomputed top feature contributions of a match
+def display_contributions(row, match):
+    st.markdown("### What drove the model's call:")
+    top = top_contributions(contribution_features, contributions, row)
+    table = pd.DataFrame({
+        'Feature': [feature_label(feature) for feature, _ in top],
+        'Value': [format_feature_value(match[feature]) for feature, _ in top],
+        'Pushes towards': ['Win' if contribution > 0 else 'Not Win' for _, contribution in top],
+        'Weight': [f"{contribution:+.3f}" for _, contribution in top],
+    })
+    st.table(table.set_index('Feature'))
 
 # Display final results after 5 rounds
 def display_final_results():
     st.subheader("Game Over!")
-    st.write(f"Thanks for playing, {st.session_state.username}!")
-    st.write(f"Your final score after 5 rounds: **{st.session_state.user_score}**")
+    game = st.session_state.game
+    st.write(f"Thanks for playing, {game.username}!")
+    st.write(f"Your final score after {ROUNDS_PER_GAME} rounds: **{game.user_score}**")
 
     # Add player to scoreboard only once
-    if not st.session_state.score_added:
-        scoreboard = load_scoreboard(sheet)
-        new_row = pd.DataFrame({'Username': [st.session_state.username], 'Score': [st.session_state.user_score]})
-        scoreboard = pd.concat([scoreboard, new_row], ignore_index=True)
-        save_scoreboard(sheet, scoreboard)
-        st.session_state.score_added = True
-    else:
-        # Load the updated scoreboard
-        scoreboard = load_scoreboard(sheet)
+    if not game.score_added:
+        # Append only the new row; the full scoreboard is never rewritten
+        append_score(backend, game.username, game.user_score)
+        game.score_added = True
 
-    # Sort the scoreboard descending by 'Score'
-    sorted_scoreboard = scoreboard.sort_values(by='Score', ascending=False).reset_index(drop=True)
+    # Show the player's rank and the players around them
+    rank = backend.rank(game.username)
+    if rank is not None:
+        st.write(f"Your rank: **{rank}** of {backend.count()} players")
+        st.write("### Players around you")
+        st.table(backend.around(game.username).set_index('Rank'))
 
-    # Display the sorted scoreboard
-    st.write("### Scoreboard")
-    st.table(sorted_scoreboard)
+    # Display one page of the scoreboard
+    display_scoreboard(backend)
 
     if st.button("Start a New Game"):
-        # Reset session state variables
-        st.session_state.game_started = False
-        st.session_state.current_game_finished = False
-        st.session_state.user_score = 0
-        st.session_state.round_count = 0
-        st.session_state.username = ""
-        st.session_state.random_game = None
-        st.session_state.user_prediction = None
-        st.session_state.score_added = False
-
-# Display the scoreboard (if needed elsewhere)
-def display_scoreboard(scoreboard):
-    st.write("### Scoreboard")
-    # Sort and display the scoreboard
-    scoreboard = scoreboard.sort_values(by='Score', ascending=False).reset_index(drop=True)
-    st.table(scoreboard)
+        # Reset the game state
+        st.session_state.game = GameState()
 
-# Load resources
-df, model = load_resources()
-
-# Initialize Google Sheets
-sheet = init_gsheets()
-
-# Load scoreboard from Google Sheets
-scoreboard = load_scoreboard(sheet)
+# Display the scoreboard one page at a time
+def display_scoreboard(backend, page_size=10):
+    st.write("### Scoreboard")
+    page_count = max(1, -(-backend.count() // page_size))
+    page = 1
+    if page_count > 1:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key='scoreboard_page')
+    st.table(backend.top(page_size, (page - 1) * page_size).set_index('Rank'))
+
+# Load resources once per process; reloaded when the CSV or the model file changes
+resources = registry.get('game', [DATA_PATH, MODEL_PATH, COMPILED_MODEL_PATH], build_resources)
+df = resources['df']
+model = resources['model']
+min_salary = resources['min_salary']
+max_salary = resources['max_salary']
+model_labels = resources['model_labels']
+model_win_probabilities = resources['model_win_probabilities']
+contribution_features = resources['contribution_features']
+contributions = resources['contributions']
+get_radar_figure = resources['get_radar_figure']
+similar_matches = resources['similar_matches']
+schedule_strata = resources['schedule_strata']
+prefetcher = resources['prefetcher']
+
+# Encode all logos once per process
+logo_cache.warm()
+
+# Create the scoreboard backend once per process
+backend = registry.get('scoreboard', [], create_scoreboard_backend)
 
 # Initialize session state
 initialize_session_state()
 
-# Calculate min and max salaries for normalization
-min_salary = df[['team_salary', 'opponent_team_salary']].min().min()
-max_salary = df[['team_salary', 'opponent_team_salary']].max().max()
-
-# Define model features
-model_features = [
-    "team_overall", "team_attack", "team_midfield", "team_defense",
-    "opponent_overall", "opponent_attack", "opponent_midfield", "opponent_defense",
-    "gf_last_4_games", "ga_last_4_games", "xg_last_4_games", "xga_last_4_games",
-    "avg_points_last_4_games", "sh_last_4_games", "sot_last_4_games", "poss_last_4_games",
-    "opponent_gf_last_4_games", "opponent_ga_last_4_games", "opponent_xga_last_4_games",
-    "opponent_avg_points_last_4_games", "team_salary", "opponent_team_salary", "hour",
-    "venue", "day", "home_team_formation", "away_team_formation", "captain", "opponent_captain", "referee"
-]
-
 # Start the app logic
-if not st.session_state.game_started:
-    landing_page(scoreboard)
-else:
-    game_page()
+with phase('rerun'):
+    if not st.session_state.game.game_started:
+        landing_page(backend)
+    else:
+        game_page()
+
+# Export the phase timings; add ?debug=1 to the URL to see them on the page
+if metrics_enabled:
+    if os.environ.get('APP_METRICS_PORT'):
+        registry.get('metrics_server', [], lambda: metrics.serve(int(os.environ['APP_METRICS_PORT'])))
+    metrics.export()
+    if st.query_params.get('debug') == '1':
+        display_metrics_panel()
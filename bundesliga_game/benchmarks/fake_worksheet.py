@@ -0,0 +1,81 @@
+# benchmarks/fake_worksheet.py
+
+import threading
+import time
+from collections import Counter
+
+class FakeWorksheet:
+    """
+    In-memory stand-in for the gspread worksheet used by utils.gsheets.
+    Implements only the calls the app makes, counts them, and can add a fixed
+    latency to every call to mimic the Sheets API.
+    """
+
+    def __init__(self, rows=(), latency=0.0):
+        self.header = ['Username', 'Score']
+        self.rows = [list(row) for row in rows]
+        self.latency = latency
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def _call(self, name):
+        with self._lock:
+            self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def row_values(self, row):
+        self._call('row_values')
+        with self._lock:
+            if row == 1:
+                return list(self.header)
+            return list(self.rows[row - 2]) if row - 2 < len(self.rows) else []
+
+    def get(self, range_name, **kwargs):
+        # Only the 'A2:B' scoreboard range is read
+        self._call('get')
+        with self._lock:
+            return [list(row) for row in self.rows]
+
+    def update(self, values, range_name=None, **kwargs):
+        self._call('update')
+        with self._lock:
+            self.header = list(values[0])
+
+    def clear(self):
+        self._call('clear')
+        with self._lock:
+            self.header = []
+            self.rows = []
+
+    def append_row(self, values, **kwargs):
+        self._call('append_row')
+        with self._lock:
+            if not self.header:
+                self.header = list(values)
+            else:
+                self.rows.append(list(values))
+
+    def append_rows(self, values, **kwargs):
+        self._call('append_rows')
+        with self._lock:
+            self.rows.extend(list(row) for row in values)
+
+    def remote_calls(self):
+        """
+        Return the number of calls per method and in total.
+        """
+        with self._lock:
+            return dict(self.calls, total=sum(self.calls.values()))
+
+def use_fake_worksheet(sheet):
+    """
+    Make the app's Google Sheets backend use sheet instead of connecting to
+    Google; must be called in the process that runs the app.
+    """
+    import utils.gsheets
+    from utils.resources import registry
+
+    utils.gsheets.init_gsheets = lambda: sheet
+    # Drop a backend created earlier in this process
+    registry.clear()
@@ -0,0 +1,111 @@
+# benchmarks/importtime.py
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'importtime_baseline.json')
+
+# Packages the landing page must render without. Streamlit itself may import
+# parts of some of them (e.g. plotly for its theme); only modules first
+# imported by the app count
+DEFERRED_PACKAGES = ['plotly', 'sklearn', 'joblib', 'gspread', 'google.oauth2', 'PIL']
+
+# Written to stderr once Streamlit is imported; later imports are the app's
+APP_IMPORTS_MARKER = '--- app imports ---'
+
+# Allowed slowdown of the total import time against the baseline
+TOLERANCE = 1.25
+
+def render_landing_page():
+    """
+    Render the landing page once and print the deferred packages the app imported.
+    Runs in the measured child process.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(APP_DIR, 'app.py'), default_timeout=60)
+    before = set(sys.modules)
+    print(APP_IMPORTS_MARKER, file=sys.stderr, flush=True)
+    at.run()
+    if at.exception:
+        raise SystemExit(f"Landing page failed: {at.exception}")
+    new_modules = set(sys.modules) - before
+    loaded = sorted(
+        package for package in DEFERRED_PACKAGES
+        if any(module == package or module.startswith(package + '.') for module in new_modules)
+    )
+    print(json.dumps(loaded))
+
+def parse_importtime(stderr):
+    """
+    Sum the cumulative -X importtime microseconds of every top-level import
+    made by the app.
+    Returns the total and the cumulative time of each top-level package.
+    """
+    packages = {}
+    lines = stderr.splitlines()
+    for line in lines[lines.index(APP_IMPORTS_MARKER) + 1:]:
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented below the package that triggered them
+        if not name[1:].startswith(' '):
+            packages[name.strip()] = packages.get(name.strip(), 0) + int(cumulative)
+    return sum(packages.values()), packages
+
+def measure(runs=3):
+    """
+    Render the landing page in fresh interpreters with -X importtime.
+    Returns the fastest run's total import time in ms, its slowest packages
+    and the deferred packages that were imported.
+    """
+    best = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(os.environ, SCOREBOARD_BACKEND='sqlite', SCOREBOARD_DB_PATH=os.path.join(tmp_dir, 'scoreboard.db'))
+        for _ in range(runs):
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', os.path.abspath(__file__), '--child'],
+                cwd=APP_DIR, env=env, capture_output=True, text=True, check=True
+            )
+            total, packages = parse_importtime(result.stderr)
+            if best is None or total < best[0]:
+                best = (total, packages, json.loads(result.stdout.strip().splitlines()[-1]))
+    total, packages, loaded = best
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:15]
+    return {
+        'app_import_ms': round(total / 1000, 1),
+        'slowest_packages_ms': {name: round(us / 1000, 1) for name, us in slowest},
+        'deferred_packages_loaded': loaded,
+    }
+
+if __name__ == '__main__':
+    # Check the landing page's cold-start imports: python benchmarks/importtime.py [--update]
+    if '--child' in sys.argv:
+        render_landing_page()
+        sys.exit()
+
+    report = measure()
+    print(f"App imports for the landing page: {report['app_import_ms']} ms")
+    for name, ms in report['slowest_packages_ms'].items():
+        print(f"  {name:<30} {ms:>8} ms")
+
+    if '--update' in sys.argv:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f"Wrote {os.path.relpath(BASELINE_PATH, APP_DIR)}")
+        sys.exit()
+
+    failures = []
+    if report['deferred_packages_loaded']:
+        failures.append(f"deferred packages imported by the landing page: {report['deferred_packages_loaded']}")
+    with open(BASELINE_PATH, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if report['app_import_ms'] > baseline['app_import_ms'] * TOLERANCE:
+        failures.append(f"import time {report['app_import_ms']} ms exceeds the baseline {baseline['app_import_ms']} ms by more than {TOLERANCE:.0%}")
+    if failures:
+        raise SystemExit("Regression: " + "; ".join(failures))
+    print(f"OK against the baseline of {baseline['app_import_ms']} ms")
@@ -0,0 +1,196 @@
+# benchmarks/load_test.py
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from websockets.sync.client import connect
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class Player:
+    """
+    One browser session talking to the app over Streamlit's websocket
+    protocol: it sends rerun requests with widget states and waits for the
+    script to finish, timing every rerun.
+    """
+
+    def __init__(self, port):
+        self.ws = connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=['streamlit'], max_size=None)
+        self.widgets = {}  # label -> widget id, from the last rerun
+        self.values = {}  # widget id -> text value
+        self.timings = []
+
+    def rerun(self, click=None, text=None):
+        """
+        Rerun the script, optionally typing into a text input {label: value}
+        and clicking the button whose label starts with click.
+        """
+        for label, value in (text or {}).items():
+            self.values[self.widgets[label]] = value
+        message = BackMsg()
+        message.rerun_script.SetInParent()
+        states = message.rerun_script.widget_states.widgets
+        for widget_id, value in self.values.items():
+            state = states.add()
+            state.id = widget_id
+            state.string_value = value
+        if click is not None:
+            state = states.add()
+            state.id = next(widget_id for label, widget_id in self.widgets.items() if label.startswith(click))
+            state.trigger_value = True
+
+        start = time.perf_counter()
+        self.ws.send(message.SerializeToString())
+        widgets = {}
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(self.ws.recv())
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type == 'exception':
+                    raise RuntimeError(element.exception.message)
+                if element_type in ('button', 'text_input'):
+                    widget = getattr(element, element_type)
+                    widgets[widget.label] = widget.id
+            elif kind == 'script_finished':
+                break
+        self.timings.append((time.perf_counter() - start) * 1000)
+        self.widgets = widgets
+
+    def play(self, username, rounds=5):
+        """
+        Start a game, make every prediction and reach the final scoreboard.
+        """
+        self.rerun()
+        self.rerun(click='Start the Game', text={'Enter your username:': username})
+        self.rerun()
+        for round_number in range(1, rounds + 1):
+            self.rerun(click='🟢 Predict')
+            if round_number < rounds:
+                self.rerun(click='Next Match')
+        self.ws.close()
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(latency, calls_path):
+    """
+    Start the app on a fake worksheet in a subprocess and wait until it answers.
+    """
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(BENCHMARK_DIR, 'serve_fake.py'), str(port), str(latency), calls_path],
+        cwd=BENCHMARK_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return server, port
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise SystemExit("The app server did not start")
+
+def peak_rss_mb(pid):
+    """
+    Peak resident memory of a process, from /proc.
+    """
+    with open(f"/proc/{pid}/status", encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return round(int(line.split()[1]) / 1024, 1)
+    return None
+
+def read_calls(path):
+    # The server refreshes the file every 0.2 s
+    time.sleep(0.5)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def run_level(players, latency):
+    """
+    Let `players` sessions play one full game each at the same time against a
+    fresh app process whose worksheet answers after `latency` seconds.
+    Returns throughput, rerun latency percentiles, the server's peak RSS and
+    the worksheet reads and writes made by the players.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        calls_path = os.path.join(tmp_dir, 'calls.json')
+        server, port = start_server(latency, calls_path)
+        try:
+            # Load the data, model and scoreboard before the clock starts
+            Player(port).play('warmup')
+            warm_calls = read_calls(calls_path)
+
+            barrier = threading.Barrier(players)
+            sessions = [Player(port) for _ in range(players)]
+            errors = []
+
+            def play(index):
+                barrier.wait()
+                try:
+                    sessions[index].play(f"load_{index}")
+                except Exception as e:
+                    errors.append(repr(e))
+
+            threads = [threading.Thread(target=play, args=(i,)) for i in range(players)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            calls = read_calls(calls_path)
+            rss = peak_rss_mb(server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+
+    timings = [ms for session in sessions for ms in session.timings]
+    return {
+        'players': players,
+        'errors': errors,
+        'seconds': round(elapsed, 2),
+        'reruns_per_s': round(len(timings) / elapsed, 1),
+        'p50_ms': round(float(np.percentile(timings, 50)), 1),
+        'p99_ms': round(float(np.percentile(timings, 99)), 1),
+        'peak_rss_mb': rss,
+        'scoreboard_reads': calls.get('get', 0) - warm_calls.get('get', 0),
+        'scoreboard_writes': calls.get('append_rows', 0) - warm_calls.get('append_rows', 0),
+        'rows_written': calls['rows'] - warm_calls['rows'],
+    }
+
+if __name__ == '__main__':
+    # Simulate concurrent players: python benchmarks/load_test.py [players ...] [--latency SECONDS]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test one app process with concurrent players.")
+    parser.add_argument('players', nargs='*', type=int, default=[1, 4, 16, 32], help="player counts to run")
+    parser.add_argument('--latency', type=float, default=0.2, help="seconds added to every worksheet call")
+    args = parser.parse_args()
+
+    print(f"Worksheet latency {args.latency * 1000:.0f} ms per call")
+    print(f"{'players':>7} {'seconds':>8} {'reruns/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'peak RSS MB':>12} {'reads':>6} {'writes':>7} {'rows':>5}")
+    for players in args.players:
+        level = run_level(players, args.latency)
+        print(f"{level['players']:>7} {level['seconds']:>8} {level['reruns_per_s']:>9} {level['p50_ms']:>8} "
+              f"{level['p99_ms']:>8} {level['peak_rss_mb']:>12} {level['scoreboard_reads']:>6} "
+              f"{level['scoreboard_writes']:>7} {level['rows_written']:>5}")
+        if level['errors']:
+            print(f"  {len(level['errors'])} players failed: {level['errors'][0]}", file=sys.stderr)
@@ -0,0 +1,116 @@
+# benchmarks/reruns.py
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reruns_baseline.json')
+sys.path.insert(0, APP_DIR)
+
+from fake_worksheet import FakeWorksheet, use_fake_worksheet
+
+# Allowed slowdown of a step's p50 against the baseline, plus an absolute
+# slack so sub-millisecond steps do not fail on noise
+TOLERANCE = 1.5
+SLACK_MS = 5.0
+
+def play_game(username, rounds=5):
+    """
+    Play one full game headlessly: landing page, start, every round and the
+    final scoreboard. Returns (step, milliseconds) for every rerun.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    timings = []
+
+    def rerun(step, element=None):
+        start = time.perf_counter()
+        (element.click() if element is not None else at).run()
+        timings.append((step, (time.perf_counter() - start) * 1000))
+        if at.exception:
+            raise SystemExit(f"{step} failed: {at.exception}")
+
+    at = AppTest.from_file(os.path.join(APP_DIR, 'app.py'), default_timeout=60)
+    rerun('landing_page')
+    at.text_input(key='username_input').input(username)
+    rerun('start_game', at.button[0])
+    rerun('game_page')
+    for round_number in range(1, rounds + 1):
+        # The last prediction also renders the final results and saves the score
+        rerun('evaluate_prediction' if round_number < rounds else 'display_final_results', at.button(key='predict_win_button'))
+        if round_number < rounds:
+            rerun('display_game_stats', next(button for button in at.button if button.label == 'Next Match'))
+    return timings
+
+def run(games=10):
+    """
+    Play several games against a fake worksheet in this process.
+    Returns p50/p95 per step, the cold first landing page and the remote
+    calls per game.
+    """
+    os.environ['SCOREBOARD_BACKEND'] = 'gsheets'
+    sheet = FakeWorksheet(rows=[(f"player_{i}", i % 7 - 3) for i in range(200)])
+    use_fake_worksheet(sheet)
+
+    steps = {}
+    cold_landing_ms = None
+    for game in range(games):
+        timings = play_game(f"bench_{game}")
+        if cold_landing_ms is None:
+            # The first rerun of the process loads the data and model
+            cold_landing_ms = timings.pop(0)[1]
+        for step, ms in timings:
+            steps.setdefault(step, []).append(ms)
+
+    calls = sheet.remote_calls()
+    return {
+        'games': games,
+        'cold_landing_page_ms': round(cold_landing_ms, 1),
+        'steps_ms': {
+            step: {
+                'reruns': len(samples),
+                'p50': round(float(np.percentile(samples, 50)), 2),
+                'p95': round(float(np.percentile(samples, 95)), 2),
+            }
+            for step, samples in steps.items()
+        },
+        'remote_calls': calls,
+        'remote_calls_per_game': round(calls['total'] / games, 2),
+    }
+
+def compare(report, baseline):
+    """
+    Return the regressions of a report against the baseline.
+    """
+    failures = []
+    for step, stats in report['steps_ms'].items():
+        base = baseline['steps_ms'].get(step)
+        if base and stats['p50'] > base['p50'] * TOLERANCE + SLACK_MS:
+            failures.append(f"{step} p50 {stats['p50']} ms > baseline {base['p50']} ms")
+    if report['remote_calls_per_game'] > baseline['remote_calls_per_game']:
+        failures.append(f"{report['remote_calls_per_game']} remote calls per game > baseline {baseline['remote_calls_per_game']}")
+    return failures
+
+if __name__ == '__main__':
+    # Benchmark full games headlessly: python benchmarks/reruns.py [--update]
+    report = run()
+    print(f"{report['games']} games, cold landing page {report['cold_landing_page_ms']} ms")
+    for step, stats in report['steps_ms'].items():
+        print(f"  {step:<24} p50 {stats['p50']:>8} ms  p95 {stats['p95']:>8} ms  ({stats['reruns']} reruns)")
+    print(f"Remote calls: {report['remote_calls']} ({report['remote_calls_per_game']} per game)")
+
+    if '--update' in sys.argv:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f"Wrote {os.path.relpath(BASELINE_PATH, APP_DIR)}")
+        sys.exit()
+
+    with open(BASELINE_PATH, encoding='utf-8') as f:
+        failures = compare(report, json.load(f))
+    if failures:
+        raise SystemExit("Regression: " + "; ".join(failures))
+    print("OK against the baseline")
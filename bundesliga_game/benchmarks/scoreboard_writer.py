@@ -0,0 +1,142 @@
+# benchmarks/scoreboard_writer.py
+
+import os
+import sys
+import threading
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from fake_worksheet import FakeWorksheet
+
+def quota_error():
+    """
+    The error gspread raises when the Sheets API answers 429.
+    """
+    import requests
+    from gspread.exceptions import APIError
+
+    response = requests.Response()
+    response.status_code = 429
+    response._content = b'{"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}}'
+    return APIError(response)
+
+class FlakyWorksheet(FakeWorksheet):
+    """
+    Fake worksheet whose next `failures` append_rows calls raise make_error().
+    With applied=True the rows are appended before the error is raised, like
+    a request that timed out after the API handled it.
+    """
+
+    def __init__(self, failures=0, applied=False, make_error=lambda: ConnectionError("Simulated Sheets API failure"), **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.applied = applied
+        self.make_error = make_error
+
+    def append_rows(self, values, **kwargs):
+        with self._lock:
+            fail = self.failures > 0
+            self.failures -= fail
+        if not fail:
+            super().append_rows(values, **kwargs)
+            return
+        self._call('append_rows_failed')
+        if self.applied:
+            with self._lock:
+                self.rows.extend(list(row) for row in values)
+        raise self.make_error()
+
+def make_backend(sheet, flush_interval=0.05):
+    from utils.gsheets import GSheetsBackend
+
+    backend = GSheetsBackend(sheet)
+    # Short intervals keep the check quick; the app keeps the defaults
+    backend.writer.flush_interval = flush_interval
+    return backend
+
+def submit_all(backend, rows, timeout=30):
+    """
+    Submit rows from one thread each, all at the same moment, and wait for
+    them to be written. Returns the number of rows not written in time.
+    """
+    barrier = threading.Barrier(len(rows))
+    events = [None] * len(rows)
+
+    def submit(index):
+        barrier.wait()
+        events[index] = backend.writer.submit(*rows[index])
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(rows))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    deadline = time.monotonic() + timeout
+    return sum(not event.wait(max(0.0, deadline - time.monotonic())) for event in events)
+
+def check_concurrent(count=500):
+    """
+    Concurrent submissions are all written exactly once, in few flushes.
+    """
+    sheet = FakeWorksheet(latency=0.05)
+    backend = make_backend(sheet)
+    rows = [(f"player_{i}", i % 7) for i in range(count)]
+    late = submit_all(backend, rows)
+    problems = []
+    if late:
+        problems.append(f"{late} rows not written in time")
+    if sorted(map(tuple, sheet.rows)) != sorted(rows):
+        problems.append(f"{len(sheet.rows)} rows in the sheet for {count} submitted")
+    if backend.writer.flushes > count // 10:
+        problems.append(f"{backend.writer.flushes} flushes for {count} rows")
+    return f"{count} concurrent rows in {backend.writer.flushes} flushes", problems
+
+def check_failures(failures=3, count=20, applied=False, make_error=None):
+    """
+    Rows survive failed writes and are written exactly once when the sheet
+    recovers, also when a failed write was applied.
+    """
+    sheet = FlakyWorksheet(failures=failures, applied=applied, **({'make_error': make_error} if make_error else {}))
+    backend = make_backend(sheet)
+    rows = [(f"player_{i}", i) for i in range(count)]
+    late = submit_all(backend, rows)
+    problems = []
+    if late:
+        problems.append(f"{late} rows not written in time")
+    if sorted(map(tuple, sheet.rows)) != sorted(rows):
+        problems.append(f"{len(sheet.rows)} rows in the sheet for {count} submitted")
+    if sheet.remote_calls().get('append_rows_failed') != failures:
+        problems.append("the injected failures were not hit")
+    return f"{count} rows written once after {failures} failed writes", problems
+
+def check_quota_failures():
+    return check_failures(make_error=quota_error)
+
+def check_applied_failures():
+    return check_failures(failures=1, applied=True)
+
+def check_lone_row():
+    """
+    A row submitted while nothing else is queued does not wait for a batch.
+    """
+    sheet = FakeWorksheet()
+    backend = make_backend(sheet, flush_interval=0.5)
+    start = time.perf_counter()
+    written = backend.writer.submit('alone', 1).wait(5)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    problems = []
+    if not written or elapsed_ms >= 500:
+        problems.append(f"a lone row took {elapsed_ms:.0f} ms to be written")
+    return f"a lone row written in {elapsed_ms:.1f} ms", problems
+
+if __name__ == '__main__':
+    # Check the scoreboard writer against a fake worksheet: python benchmarks/scoreboard_writer.py
+    failures = []
+    for check in (check_concurrent, check_failures, check_quota_failures, check_applied_failures, check_lone_row):
+        summary, problems = check()
+        print(f"{'FAIL' if problems else 'OK  '} {check.__name__}: {summary}")
+        failures.extend(problems)
+    if failures:
+        raise SystemExit("Failed: " + "; ".join(failures))
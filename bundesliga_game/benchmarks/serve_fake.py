@@ -0,0 +1,44 @@
+# benchmarks/serve_fake.py
+
+import json
+import os
+import sys
+import threading
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from fake_worksheet import FakeWorksheet, use_fake_worksheet
+
+def write_calls(sheet, path, interval=0.2):
+    """
+    Keep a JSON file with the worksheet call counts up to date.
+    """
+    while True:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(sheet.remote_calls(), rows=len(sheet.rows)), f)
+        os.replace(tmp_path, path)
+        time.sleep(interval)
+
+if __name__ == '__main__':
+    # Serve the app on a fake worksheet: python benchmarks/serve_fake.py PORT LATENCY CALLS_FILE
+    port, latency, calls_path = int(sys.argv[1]), float(sys.argv[2]), sys.argv[3]
+    from streamlit.web import bootstrap
+
+    os.environ['SCOREBOARD_BACKEND'] = 'gsheets'
+    sheet = FakeWorksheet(rows=[(f"player_{i}", i % 7 - 3) for i in range(200)], latency=latency)
+    use_fake_worksheet(sheet)
+    threading.Thread(target=write_calls, args=(sheet, calls_path), name='calls-writer', daemon=True).start()
+
+    flag_options = {
+        'server_port': port,
+        'server_headless': True,
+        'server_fileWatcherType': 'none',
+        'server_enableXsrfProtection': False,
+        'browser_gatherUsageStats': False,
+        'logger_level': 'error',
+    }
+    bootstrap.load_config_options(flag_options)
+    bootstrap.run(os.path.join(APP_DIR, 'app.py'), False, [], flag_options)
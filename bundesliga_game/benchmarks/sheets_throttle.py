@@ -0,0 +1,226 @@
+# benchmarks/sheets_throttle.py
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+SPREADSHEET_ID = 'local-scoreboard'
+SHEET_TITLE = 'Scoreboard'
+
+class FakeSheetsAPI:
+    """
+    Local stand-in for the parts of the Sheets v4 API the app uses: spreadsheet
+    metadata, values get/update and values append on a single worksheet.
+    Answers a share of the requests with 429 (quota) or 503, adds a fixed
+    latency, and records the most requests it handled at the same time.
+    """
+
+    def __init__(self, rows=(), throttle_rate=0.3, error_rate=0.1, latency=0.02, seed=0):
+        self.values = [['Username', 'Score']] + [list(row) for row in rows]
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.responses = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def serve(self, host='127.0.0.1'):
+        """
+        Serve the API from a daemon thread. Returns the server.
+        """
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                api.handle(self, 'GET')
+
+            def do_POST(self):
+                api.handle(self, 'POST')
+
+            def do_PUT(self):
+                api.handle(self, 'PUT')
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, 0), Handler)
+        threading.Thread(target=server.serve_forever, name='fake-sheets-api', daemon=True).start()
+        return server
+
+    def handle(self, handler, method):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            roll = self.random.random()
+        try:
+            time.sleep(self.latency)
+            if roll < self.throttle_rate:
+                status, body = 429, {'error': {'code': 429, 'message': 'Quota exceeded', 'status': 'RESOURCE_EXHAUSTED'}}
+            elif roll < self.throttle_rate + self.error_rate and method == 'GET':
+                # Only reads fail after the fact; a failed write is never applied here
+                status, body = 503, {'error': {'code': 503, 'message': 'The service is currently unavailable.', 'status': 'UNAVAILABLE'}}
+            else:
+                length = int(handler.headers.get('Content-Length') or 0)
+                payload = json.loads(handler.rfile.read(length)) if length else {}
+                status, body = self.route(method, urlparse(handler.path), payload)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.responses[status] = self.responses.get(status, 0) + 1
+        data = json.dumps(body).encode()
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def route(self, method, url, payload):
+        path = unquote(url.path)
+        prefix = f"/v4/spreadsheets/{SPREADSHEET_ID}"
+        if not path.startswith(prefix):
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        path = path[len(prefix):]
+        if method == 'GET' and path == '':
+            return 200, self.metadata()
+        if not path.startswith('/values/'):
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        range_name = path[len('/values/'):]
+        with self._lock:
+            if method == 'POST' and range_name.endswith(':append'):
+                self.values.extend(list(row) for row in payload['values'])
+                return 200, {'spreadsheetId': SPREADSHEET_ID, 'updates': {'updatedRows': len(payload['values'])}}
+            first, last = self.row_span(range_name)
+            if method == 'GET':
+                rows = [row for row in self.values[first - 1:last] if row]
+                return 200, {'range': range_name, 'majorDimension': 'ROWS', **({'values': rows} if rows else {})}
+            if method == 'PUT':
+                for offset, row in enumerate(payload['values']):
+                    while len(self.values) < first + offset:
+                        self.values.append([])
+                    self.values[first - 1 + offset] = list(row)
+                return 200, {'spreadsheetId': SPREADSHEET_ID, 'updatedRange': range_name}
+        return 405, {'error': {'code': 405, 'message': 'Method not allowed.'}}
+
+    @staticmethod
+    def row_span(range_name):
+        """
+        First and last row (1-based, last None when open) of an A1 range.
+        """
+        cells = range_name.split('!')[-1]
+        rows = [int(re.sub(r'\D', '', cell) or 0) or None for cell in cells.split(':')]
+        first = rows[0] or 1
+        last = rows[1] if len(rows) > 1 else first
+        return first, last
+
+    def metadata(self):
+        return {
+            'spreadsheetId': SPREADSHEET_ID,
+            'properties': {'title': 'Scoreboard', 'locale': 'en_US', 'timeZone': 'Etc/UTC'},
+            'sheets': [{'properties': {
+                'sheetId': 0, 'title': SHEET_TITLE, 'index': 0, 'sheetType': 'GRID',
+                'gridProperties': {'rowCount': 1000, 'columnCount': 26},
+            }}],
+        }
+
+    def rows(self):
+        with self._lock:
+            return [list(row) for row in self.values[1:] if row]
+
+class LocalSheetsAdapter(HTTPAdapter):
+    """
+    Transport adapter that sends Sheets API requests to the local stand-in.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def send(self, request, **kwargs):
+        request.url = request.url.replace('https://sheets.googleapis.com', self.base_url, 1)
+        return super().send(request, **kwargs)
+
+def run(players=16, games=3, throttle_rate=0.3, error_rate=0.1):
+    """
+    Let `players` threads share one client, each reading the scoreboard and
+    appending a score `games` times against a throttling stand-in.
+    Returns the stand-in's and the client's counts and the problems found.
+    """
+    from utils.gsheets import GSheetsBackend, fetch_scoreboard
+    from utils.sheets_client import ResilientHTTPClient, create_sheets_client
+
+    api = FakeSheetsAPI(rows=[(f"player_{i}", i % 7 - 3) for i in range(50)],
+                        throttle_rate=throttle_rate, error_rate=error_rate)
+    server = api.serve()
+    session = requests.Session()
+    session.mount('https://sheets.googleapis.com', LocalSheetsAdapter(f"http://127.0.0.1:{server.server_port}"))
+    client = create_sheets_client(None, session=session)
+    # Keep the test short; production keeps the default delays
+    client.http_client.base_delay = 0.02
+    sheet = client.open_by_key(SPREADSHEET_ID).worksheet(SHEET_TITLE)
+    backend = GSheetsBackend(sheet)
+
+    barrier = threading.Barrier(players)
+    errors = []
+    reads = []
+
+    def play(index):
+        barrier.wait()
+        try:
+            for game in range(games):
+                reads.append(len(fetch_scoreboard(sheet)))
+                backend.write_rows([[f"load_{index}_{game}", game]])
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=play, args=(i,)) for i in range(players)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    expected = sorted(f"load_{i}_{g}" for i in range(players) for g in range(games))
+    written = sorted(row[0] for row in api.rows() if str(row[0]).startswith('load_'))
+    problems = list(errors)
+    if written != expected:
+        problems.append(f"{len(written)} rows written for {len(expected)} scores ({len(set(written))} distinct)")
+    if api.max_in_flight > ResilientHTTPClient.max_concurrent:
+        problems.append(f"{api.max_in_flight} requests in flight > limit {ResilientHTTPClient.max_concurrent}")
+    if reads and min(reads) < 50:
+        problems.append(f"a read returned {min(reads)} rows, fewer than the 50 seeded")
+    return {
+        'players': players,
+        'games': games,
+        'seconds': round(elapsed, 2),
+        'responses': dict(sorted(api.responses.items())),
+        'max_in_flight': api.max_in_flight,
+        'client': client.http_client.stats(),
+        'problems': problems,
+    }
+
+if __name__ == '__main__':
+    # Check the Sheets client against a throttling stand-in: python benchmarks/sheets_throttle.py [players]
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    report = run(players)
+    print(f"{report['players']} players x {report['games']} games in {report['seconds']} s")
+    print(f"  stand-in responses by status: {report['responses']}, at most {report['max_in_flight']} in flight")
+    print(f"  client: {report['client']}")
+    if report['problems']:
+        raise SystemExit("Failed: " + "; ".join(report['problems']))
+    print("OK: every score appended once, reads complete, concurrency within the limit")
@@ -0,0 +1,166 @@
+# utils/assets.py
+
+import io
+import json
+import os
+
+from utils.evaluation import file_fingerprint
+
+LOGO_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'logos'))
+BUILD_DIR = os.path.join(LOGO_DIR, 'build')
+MANIFEST_PATH = os.path.join(BUILD_DIR, 'manifest.json')
+
+# Display sizes at 1x, matching the CSS and HTML that show the logos
+TEAM_LOGO_HEIGHT = 150  # .team-logo in local_css()
+BANNER_LOGOS = {'Bundesliga Logo': 300}  # width on the landing page
+
+# The only variant built: logos are inlined into the page as base64, so a
+# srcset would send every variant; 2x keeps them sharp on high-DPI screens
+SERVED_SCALE = '2x'
+
+MIME_TYPES = {
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+
+def get_mime_type(path):
+    """
+    Get the MIME type of an image from its file extension.
+    """
+    return MIME_TYPES.get(os.path.splitext(path)[1].lower(), 'image/png')
+
+def _resize(image, name, scale):
+    """
+    Scale an image down to its display size, never up.
+    """
+    factor = int(scale[0])
+    if name in BANNER_LOGOS:
+        width = BANNER_LOGOS[name] * factor
+        height = round(image.height * width / image.width)
+    else:
+        height = TEAM_LOGO_HEIGHT * factor
+        width = round(image.width * height / image.height)
+    if image.height <= height:
+        return image
+    return image.resize((width, height), resample=3)  # Lanczos
+
+def _encode_smallest(image):
+    """
+    Encode an image as lossy WebP, lossless WebP and optimized PNG.
+    Returns the extension and bytes of the smallest one.
+    """
+    candidates = []
+    for ext, kwargs in [
+        ('.webp', {'format': 'WEBP', 'quality': 85, 'method': 6}),
+        ('.webp', {'format': 'WEBP', 'lossless': True, 'method': 6}),
+        ('.png', {'format': 'PNG', 'optimize': True}),
+    ]:
+        buffer = io.BytesIO()
+        image.save(buffer, **kwargs)
+        candidates.append((len(buffer.getvalue()), ext, buffer.getvalue()))
+    _, ext, data = min(candidates, key=lambda candidate: candidate[0])
+    return ext, data
+
+def build_logo_assets(logo_dir=LOGO_DIR, build_dir=BUILD_DIR):
+    """
+    Write a display-sized, compressed variant of every logo at SERVED_SCALE
+    and a manifest that maps logo names to them.
+    """
+    from PIL import Image
+
+    os.makedirs(build_dir, exist_ok=True)
+    manifest = {'served_scale': SERVED_SCALE, 'logos': {}}
+    for file_name in sorted(os.listdir(logo_dir)):
+        source_path = os.path.join(logo_dir, file_name)
+        if not os.path.isfile(source_path):
+            continue
+        name, _ = os.path.splitext(file_name)
+        with Image.open(source_path) as source:
+            image = source.convert('RGBA')
+
+        resized = _resize(image, name, SERVED_SCALE)
+        ext, data = _encode_smallest(resized)
+        # Keep the original when it is already display-sized and smaller
+        if resized is image and os.path.getsize(source_path) <= len(data):
+            with open(source_path, 'rb') as f:
+                ext, data = os.path.splitext(file_name)[1].lower(), f.read()
+        variant_name = f"{name}@{SERVED_SCALE}{ext}"
+        with open(os.path.join(build_dir, variant_name), 'wb') as f:
+            f.write(data)
+        manifest['logos'][name] = {
+            'source': file_name,
+            'source_sha256': file_fingerprint(source_path),
+            'variants': {SERVED_SCALE: variant_name},
+        }
+
+    with open(os.path.join(build_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+def load_manifest(manifest_path=MANIFEST_PATH, logo_dir=LOGO_DIR):
+    """
+    Load the logo manifest, or return None if the assets have not been built.
+    Logos whose source file changed since the build are left out, so the
+    original is shown until `python -m utils.assets` is run again.
+    """
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    current = {}
+    for name, info in manifest['logos'].items():
+        try:
+            if file_fingerprint(os.path.join(logo_dir, info['source'])) == info.get('source_sha256'):
+                current[name] = info
+        except FileNotFoundError:
+            pass
+    manifest['logos'] = current
+    return manifest
+
+def resolve_logo_path(name, default_path, manifest):
+    """
+    Get the path of the built variant of a logo, or default_path if there is none.
+    """
+    if manifest is None or name not in manifest['logos']:
+        return default_path
+    variant_name = manifest['logos'][name]['variants'][manifest['served_scale']]
+    return os.path.join(BUILD_DIR, variant_name)
+
+def page_bytes_report(manifest, logo_dir=LOGO_DIR, build_dir=BUILD_DIR):
+    """
+    Compare the base64 bytes of logos inlined into each page before and after the build.
+    """
+    def base64_size(path):
+        return 4 * ((os.path.getsize(path) + 2) // 3)
+
+    before, after = {}, {}
+    for name, info in manifest['logos'].items():
+        before[name] = base64_size(os.path.join(logo_dir, info['source']))
+        after[name] = base64_size(os.path.join(build_dir, info['variants'][manifest['served_scale']]))
+
+    # The game page shows two team logos, the landing page the banner
+    team_names = [name for name in manifest['logos'] if f"{name}.png" == manifest['logos'][name]['source']]
+    banner = next(iter(BANNER_LOGOS))
+
+    def game_page(sizes):
+        team_sizes = sorted(sizes[name] for name in team_names)
+        return {
+            'average': round(2 * sum(team_sizes) / len(team_sizes)),
+            'max': sum(team_sizes[-2:]),
+        }
+
+    return {
+        'landing_page': {'before': before[banner], 'after': after[banner]},
+        'game_page_average': {'before': game_page(before)['average'], 'after': game_page(after)['average']},
+        'game_page_max': {'before': game_page(before)['max'], 'after': game_page(after)['max']},
+    }
+
+if __name__ == '__main__':
+    # Build the logo variants and print the page size report: python -m utils.assets
+    manifest = build_logo_assets()
+    print(f"Built {len(manifest['logos'])} logos into {BUILD_DIR}")
+    for page, sizes in page_bytes_report(manifest).items():
+        print(f"{page}: {sizes['before']:,} -> {sizes['after']:,} base64 bytes")
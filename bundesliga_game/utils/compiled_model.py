@@ -0,0 +1,189 @@
+# utils/compiled_model.py
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.evaluation import file_fingerprint
+
+FORMAT_VERSION = 1
+
+def export_pipeline(pipeline, model_path=None):
+    """
+    Flatten the fitted preprocessor + logistic regression pipeline into plain
+    lists and dicts: imputer fill values, scaler parameters, a category to
+    column index map per categorical feature and the coefficient vector.
+    With model_path, the SHA-256 of the pickle the pipeline was loaded from
+    is recorded, so a stale export can be detected.
+    """
+    preprocessor = pipeline.named_steps['preprocessor']
+    classifier = pipeline.named_steps['classifier']
+    transformers = {name: (transformer, columns) for name, transformer, columns in preprocessor.transformers_}
+
+    numeric, numeric_columns = transformers['num']
+    categorical, categorical_columns = transformers['cat']
+    numeric_imputer = numeric.named_steps['imputer']
+    scaler = numeric.named_steps['scaler']
+    categorical_imputer = categorical.named_steps['imputer']
+    encoder = categorical.named_steps['encoder']
+
+    # One-hot columns follow the numeric columns in the transformed matrix
+    category_index = {}
+    offset = len(numeric_columns)
+    for column, categories in zip(categorical_columns, encoder.categories_):
+        category_index[column] = {str(category): offset + i for i, category in enumerate(categories)}
+        offset += len(categories)
+
+    return {
+        'format_version': FORMAT_VERSION,
+        'numeric_columns': list(numeric_columns),
+        'numeric_fill': numeric_imputer.statistics_.tolist(),
+        'scaler_mean': scaler.mean_.tolist() if scaler.with_mean else [0.0] * len(numeric_columns),
+        'scaler_scale': scaler.scale_.tolist() if scaler.with_std else [1.0] * len(numeric_columns),
+        'categorical_columns': list(categorical_columns),
+        'categorical_fill': [str(value) for value in categorical_imputer.statistics_],
+        'category_index': category_index,
+        'coef': classifier.coef_[0].tolist(),
+        'intercept': float(classifier.intercept_[0]),
+        'classes': [int(label) for label in classifier.classes_],
+        'model_sha256': file_fingerprint(model_path) if model_path else None,
+    }
+
+class CompiledModel:
+    """
+    NumPy-only scorer for the exported logistic regression pipeline.
+    Mirrors the predict/predict_proba/classes_ interface of the sklearn
+    pipeline, so it can be used in its place without importing sklearn.
+    """
+
+    def __init__(self, spec):
+        self.numeric_columns = spec['numeric_columns']
+        self.categorical_columns = spec['categorical_columns']
+        self.numeric_fill = np.array(spec['numeric_fill'])
+        self.scaler_mean = np.array(spec['scaler_mean'])
+        self.scaler_scale = np.array(spec['scaler_scale'])
+        self.categorical_fill = spec['categorical_fill']
+        self.category_index = spec['category_index']
+        self.coef = np.array(spec['coef'])
+        self.intercept = spec['intercept']
+        self.classes_ = np.array(spec['classes'])
+        self.model_sha256 = spec.get('model_sha256')
+        self.numeric_coef = self.coef[:len(self.numeric_columns)]
+        self.feature_names_in_ = np.array(self.numeric_columns + self.categorical_columns, dtype=object)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a model written by save_compiled_model.
+        """
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def is_exported_from(self, model_path):
+        """
+        Whether this model was exported from the pickle at model_path as it is now.
+        """
+        return self.model_sha256 is not None and self.model_sha256 == file_fingerprint(model_path)
+
+    def encode(self, df):
+        """
+        Apply the preprocessing to a DataFrame.
+        Returns the scaled numeric matrix (rows, numeric features) and the
+        one-hot column index of each categorical feature (rows, categorical
+        features), with -1 for categories unseen during training.
+        """
+        numeric = df[self.numeric_columns].to_numpy(dtype=np.float64)
+        numeric = np.where(np.isnan(numeric), self.numeric_fill, numeric)
+        scaled = (numeric - self.scaler_mean) / self.scaler_scale
+
+        indices = np.empty((len(df), len(self.categorical_columns)), dtype=np.int64)
+        for j, (column, fill) in enumerate(zip(self.categorical_columns, self.categorical_fill)):
+            values = pd.Categorical(df[column])
+            lookup = self.category_index[column]
+            # Map each distinct category once, then gather by code; missing values get the fill value
+            category_columns = np.array([lookup.get(str(category), -1) for category in values.categories] + [lookup.get(fill, -1)])
+            indices[:, j] = category_columns[values.codes]
+        return scaled, indices
+
+    def decision_function(self, df):
+        """
+        Return the logistic regression decision values.
+        """
+        scaled, indices = self.encode(df)
+        # Unknown categories (-1) gather the padding zero at the end
+        padded_coef = np.append(self.coef, 0.0)
+        return scaled @ self.numeric_coef + padded_coef[indices].sum(axis=1) + self.intercept
+
+    def predict_proba(self, df):
+        """
+        Return the probabilities of both classes, like LogisticRegression.
+        """
+        probability = 1.0 / (1.0 + np.exp(-self.decision_function(df)))
+        return np.column_stack([1.0 - probability, probability])
+
+    def predict(self, df):
+        """
+        Return the predicted class labels.
+        """
+        return self.classes_[(self.decision_function(df) > 0).astype(int)]
+
+    def score_row(self, row):
+        """
+        Win probability of a single match given as a dict or Series, with
+        no DataFrame construction.
+        """
+        decision = self.intercept
+        for i, column in enumerate(self.numeric_columns):
+            value = float(row[column])
+            if value != value:  # NaN
+                value = self.numeric_fill[i]
+            decision += (value - self.scaler_mean[i]) / self.scaler_scale[i] * self.numeric_coef[i]
+        for column, fill in zip(self.categorical_columns, self.categorical_fill):
+            value = row[column]
+            index = self.category_index[column].get(fill if pd.isna(value) else str(value))
+            if index is not None:
+                decision += self.coef[index]
+        return 1.0 / (1.0 + np.exp(-decision))
+
+def save_compiled_model(spec, path):
+    """
+    Write an exported pipeline to a JSON file.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(spec, f, ensure_ascii=False)
+
+def check_parity(pipeline, compiled, df):
+    """
+    Compare the compiled model with the sklearn pipeline on every row of df.
+    Returns the row positions whose labels differ and the largest difference
+    in win probability.
+    """
+    features = list(compiled.feature_names_in_)
+    label_mismatches = np.flatnonzero(pipeline.predict(df[features]) != compiled.predict(df))
+    max_probability_diff = float(np.max(np.abs(pipeline.predict_proba(df[features]) - compiled.predict_proba(df))))
+    return label_mismatches.tolist(), max_probability_diff
+
+if __name__ == '__main__':
+    # Export the pickled pipeline and check it against sklearn: python -m utils.compiled_model
+    import joblib
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(script_dir, '..', 'data')
+    model_path = os.path.join(data_dir, 'best_lr_model.pkl')
+    pipeline = joblib.load(model_path)
+    df = pd.read_csv(os.path.join(data_dir, 'bundesliga_matches.csv'))
+
+    spec = export_pipeline(pipeline, model_path)
+    compiled = CompiledModel(spec)
+    label_mismatches, max_probability_diff = check_parity(pipeline, compiled, df)
+    print(f"Checked {len(df)} rows: {len(label_mismatches)} label mismatches, "
+          f"max probability difference {max_probability_diff:.2e}.")
+    row_diff = max(abs(compiled.score_row(df.iloc[i]) - compiled.predict_proba(df.iloc[[i]])[0, 1]) for i in range(len(df)))
+    print(f"Single-row scoring differs from batch scoring by at most {row_diff:.2e}.")
+    if label_mismatches or max_probability_diff > 1e-9 or row_diff > 1e-9:
+        raise SystemExit("Compiled model does not match the pipeline; not written.")
+
+    save_compiled_model(spec, os.path.join(data_dir, 'compiled_lr_model.json'))
+    print("Wrote data/compiled_lr_model.json")
@@ -0,0 +1,92 @@
+# utils/contributions.py
+
+import numpy as np
+
+from utils.compiled_model import CompiledModel
+
+# Readable names for the parts of the feature names
+LABEL_WORDS = {
+    'gf': 'goals for', 'ga': 'goals against', 'xg': 'xG', 'xga': 'xGA',
+    'sh': 'shots', 'sot': 'shots on target', 'poss': 'possession',
+    'avg': 'average',
+}
+
+def feature_label(feature):
+    """
+    Turn a feature name into a label, e.g. 'opponent_xga_last_4_games'
+    into 'Opponent xGA (last 4 games)'.
+    """
+    name, suffix = feature, ''
+    if name.endswith('_last_4_games'):
+        name, suffix = name[:-len('_last_4_games')], ' (last 4 games)'
+    words = [LABEL_WORDS.get(word, word) for word in name.split('_')]
+    label = ' '.join(words)
+    return label[:1].upper() + label[1:] + suffix
+
+def format_feature_value(value):
+    """
+    Show a feature value as text, with floats (including NumPy's float32
+    store columns) rounded to two decimals without trailing zeros.
+    """
+    if isinstance(value, (float, np.floating)):
+        return f"{value:.2f}".rstrip('0').rstrip('.')
+    return str(value)
+
+def compute_contributions(model, df):
+    """
+    Split the model's decision value for every match into one contribution
+    per feature, in one vectorized pass: coefficient x scaled value for the
+    numeric features, the coefficient of the match's category for the
+    categorical ones. Each row sums to the decision value minus the intercept.
+    Returns the feature names and the (rows, features) float32 matrix.
+    """
+    if not isinstance(model, CompiledModel):
+        # The sklearn pipeline fallback is flattened the same way as the exported model
+        from utils.compiled_model import export_pipeline
+        model = CompiledModel(export_pipeline(model))
+    scaled, indices = model.encode(df)
+    # Unknown categories (-1) gather the padding zero at the end
+    padded_coef = np.append(model.coef, 0.0)
+    contributions = np.hstack([scaled * model.numeric_coef, padded_coef[indices]]).astype(np.float32)
+    return list(model.feature_names_in_), contributions
+
+def top_contributions(features, contributions, row, k=5):
+    """
+    Get the k features that moved the model's decision the most for a match
+    row, as (feature, contribution) pairs by decreasing size. Positive
+    contributions push towards a win.
+    """
+    values = contributions[row]
+    k = min(k, len(values))
+    top = np.argpartition(-np.abs(values), k - 1)[:k]
+    top = top[np.argsort(-np.abs(values[top]))]
+    return [(features[i], float(values[i])) for i in top]
+
+if __name__ == '__main__':
+    # Check the contributions against the model's decision values and time
+    # the lookup: python -m utils.contributions
+    import os
+    import time
+
+    import pandas as pd
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    df = pd.read_csv(os.path.join(script_dir, '..', 'data', 'bundesliga_matches.csv'))
+    model = CompiledModel.load(os.path.join(script_dir, '..', 'data', 'compiled_lr_model.json'))
+
+    start = time.perf_counter()
+    features, contributions = compute_contributions(model, df)
+    build_ms = (time.perf_counter() - start) * 1000
+    max_diff = float(np.max(np.abs(contributions.sum(axis=1, dtype=np.float64) + model.intercept - model.decision_function(df))))
+    print(f"{contributions.shape[0]} rows x {contributions.shape[1]} features in {build_ms:.1f} ms; "
+          f"sums differ from the decision values by at most {max_diff:.2e}.")
+
+    rows = np.random.default_rng(0).integers(len(df), size=10000)
+    start = time.perf_counter()
+    for row in rows:
+        top_contributions(features, contributions, row)
+    print(f"Lookup: {(time.perf_counter() - start) / len(rows) * 1e6:.1f} µs per row.")
+    for feature, contribution in top_contributions(features, contributions, 0):
+        print(f"  {feature_label(feature):<40} {df[feature].iloc[0]!s:>12} {contribution:+.3f}")
+    if max_diff > 1e-4:
+        raise SystemExit("Contributions do not add up to the decision values.")
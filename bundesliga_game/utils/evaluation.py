@@ -0,0 +1,155 @@
+# utils/evaluation.py
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Columns the metrics are broken down by
+SLICE_COLUMNS = ['season', 'team', 'venue', 'referee']
+
+# Label of rows whose slice value is missing
+MISSING_LABEL = 'Unknown'
+
+# Predicted probabilities are clipped before taking logs
+EPSILON = 1e-15
+
+def file_fingerprint(path):
+    """
+    SHA-256 of a file, so an evaluation can be matched to the exact model and data.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _grouped_metrics(codes, group_count, y_true, y_pred, losses):
+    """
+    Confusion matrices, accuracy and log loss for every group at once.
+    codes holds the group of each row (0 to group_count - 1).
+    Returns one metrics dict per group.
+    """
+    # Each row falls into one of 4 cells per group: 2 * real + predicted
+    cells = np.bincount(codes * 4 + y_true * 2 + y_pred, minlength=group_count * 4).reshape(group_count, 2, 2)
+    loss_sums = np.bincount(codes, weights=losses, minlength=group_count)
+    rows = cells.sum(axis=(1, 2))
+    correct = cells[:, 0, 0] + cells[:, 1, 1]
+    return [
+        {
+            'matches': int(rows[i]),
+            'accuracy': round(float(correct[i] / rows[i]), 4),
+            'log_loss': round(float(loss_sums[i] / rows[i]), 4),
+            # Rows are the real result, columns the prediction: [[Not Win, Win], ...]
+            'confusion_matrix': cells[i].tolist(),
+        }
+        for i in range(group_count)
+    ]
+
+def evaluate_predictions(df, real_win, labels, win_probabilities, slice_columns=SLICE_COLUMNS):
+    """
+    Score precomputed predictions against the real results.
+    Returns the overall metrics and, for every slice column, the metrics of
+    each of its values.
+    """
+    y_true = np.asarray(real_win, dtype=np.int64)
+    y_pred = np.asarray(labels, dtype=np.int64)
+    p = np.clip(np.asarray(win_probabilities, dtype=np.float64), EPSILON, 1 - EPSILON)
+    losses = -(y_true * np.log(p) + (1 - y_true) * np.log(1 - p))
+
+    evaluation = {
+        'overall': _grouped_metrics(np.zeros(len(y_true), dtype=np.int64), 1, y_true, y_pred, losses)[0],
+        'slices': {},
+    }
+    for column in slice_columns:
+        codes, values = pd.factorize(df[column], sort=True)
+        values = [str(value) for value in values]
+        # Missing values (-1) are grouped under their own label
+        if (codes < 0).any():
+            codes = np.where(codes < 0, len(values), codes)
+            values.append(MISSING_LABEL)
+        metrics = _grouped_metrics(codes.astype(np.int64), len(values), y_true, y_pred, losses)
+        evaluation['slices'][column] = dict(zip(values, metrics))
+    return evaluation
+
+def evaluate_model(df, model, model_features, slice_columns=SLICE_COLUMNS):
+    """
+    Predict every match in one batch and evaluate the predictions.
+    """
+    from utils.predictions import precompute_predictions
+
+    labels, win_probabilities = precompute_predictions(df, model, model_features)
+    return evaluate_predictions(df, df['result'] == 'W', labels, win_probabilities, slice_columns)
+
+def save_evaluation(evaluation, path):
+    """
+    Write an evaluation to a JSON file, replacing any previous one in one step.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(evaluation, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+def load_evaluation(path):
+    """
+    Load a saved evaluation, or return None if there is none.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def is_evaluation_current(evaluation, data_path, model_path):
+    """
+    Whether an evaluation was computed on the data and model files as they are now.
+    """
+    source = evaluation.get('source') or {}
+    try:
+        return (source.get('data_sha256') == file_fingerprint(data_path)
+                and source.get('model_sha256') == file_fingerprint(model_path))
+    except FileNotFoundError:
+        return False
+
+def slice_frame(evaluation, column):
+    """
+    Flatten the metrics of one slice column into a DataFrame for display.
+    """
+    rows = [
+        (value, metrics['matches'], metrics['accuracy'], metrics['log_loss'])
+        for value, metrics in evaluation['slices'][column].items()
+    ]
+    return pd.DataFrame(rows, columns=[column.capitalize(), 'Matches', 'Accuracy', 'Log Loss'])
+
+if __name__ == '__main__':
+    # Evaluate the model on every match: python -m utils.evaluation
+    import time
+    import joblib
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(script_dir, '..', 'data')
+    data_path = os.path.join(data_dir, 'bundesliga_matches.csv')
+    model_path = os.path.join(data_dir, 'best_lr_model.pkl')
+
+    start = time.perf_counter()
+    df = pd.read_csv(data_path)
+    model = joblib.load(model_path)
+    evaluation = evaluate_model(df, model, list(model.feature_names_in_))
+    evaluation['source'] = {
+        'data_sha256': file_fingerprint(data_path),
+        'model_sha256': file_fingerprint(model_path),
+    }
+    save_evaluation(evaluation, os.path.join(data_dir, 'model_evaluation.json'))
+    elapsed = time.perf_counter() - start
+
+    overall = evaluation['overall']
+    (tn, fp), (fn, tp) = overall['confusion_matrix']
+    print(f"{overall['matches']} matches: accuracy {overall['accuracy']:.3f}, log loss {overall['log_loss']:.3f}")
+    print(f"Confusion matrix (real x predicted): Not Win [{tn} {fp}], Win [{fn} {tp}]")
+    for column in SLICE_COLUMNS:
+        frame = slice_frame(evaluation, column).sort_values('Accuracy')
+        print(f"\nBy {column} ({len(frame)} values), lowest accuracy first:")
+        print(frame.head(5).to_string(index=False))
+    print(f"\nWrote data/model_evaluation.json in {elapsed:.2f}s")
@@ -0,0 +1,155 @@
+# utils/game_state.py
+
+import sys
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+class Outcome(IntEnum):
+    """
+    Result of one round from the player's point of view.
+    """
+    USER_ONLY_CORRECT = 0  # +1 point
+    MODEL_ONLY_CORRECT = 1  # -1 point
+    BOTH_CORRECT = 2
+    BOTH_WRONG = 3
+
+SCORE_MESSAGES = {
+    Outcome.USER_ONLY_CORRECT: "Congratulations! You predicted correctly and the model was wrong. You get 1 point!",
+    Outcome.MODEL_ONLY_CORRECT: "The model predicted correctly, but you were wrong. You lose 1 point.",
+    Outcome.BOTH_CORRECT: "Both you and the model predicted correctly. No points awarded.",
+    Outcome.BOTH_WRONG: "Both you and the model predicted incorrectly. No points awarded.",
+}
+
+SCORE_CHANGES = {
+    Outcome.USER_ONLY_CORRECT: 1,
+    Outcome.MODEL_ONLY_CORRECT: -1,
+    Outcome.BOTH_CORRECT: 0,
+    Outcome.BOTH_WRONG: 0,
+}
+
+# Bits of a round code
+USER_WIN = 1
+MODEL_WIN = 2
+REAL_WIN = 4
+
+def encode_round(user_win, model_win, real_win):
+    """
+    Pack the three Win/Not Win calls of a round into one small integer.
+    """
+    return (USER_WIN if user_win else 0) | (MODEL_WIN if model_win else 0) | (REAL_WIN if real_win else 0)
+
+def round_outcome(code):
+    """
+    Get the Outcome of a round code.
+    """
+    real_win = bool(code & REAL_WIN)
+    user_correct = bool(code & USER_WIN) == real_win
+    model_correct = bool(code & MODEL_WIN) == real_win
+    if user_correct and not model_correct:
+        return Outcome.USER_ONLY_CORRECT
+    if model_correct and not user_correct:
+        return Outcome.MODEL_ONLY_CORRECT
+    if user_correct:
+        return Outcome.BOTH_CORRECT
+    return Outcome.BOTH_WRONG
+
+def win_label(is_win):
+    """
+    Render a Win/Not Win label.
+    """
+    return 'Win' if is_win else 'Not Win'
+
+@dataclass(slots=True)
+class GameState:
+    """
+    Everything a session needs to know about its game.
+    Matches are kept as row positions and each played round as one code
+    from encode_round(); display strings are rendered from these on demand.
+    """
+    username: str = ""
+    game_started: bool = False
+    current_game_finished: bool = False
+    score_added: bool = False  # Flag to prevent duplicate entries
+    round_count: int = 0
+    user_score: int = 0
+    schedule: tuple = ()  # Row positions of this game's matches
+    rounds: bytearray = field(default_factory=bytearray)  # One code per played round
+    clicked_at: float = 0.0  # time.perf_counter() of the last "Next Match" click
+
+    def current_row(self):
+        """
+        Row position of the current round's match.
+        """
+        return self.schedule[self.round_count - 1]
+
+    def record_round(self, user_win, model_win, real_win):
+        """
+        Store the calls of the current round and update the score.
+        Returns the round's Outcome.
+        """
+        code = encode_round(user_win, model_win, real_win)
+        self.rounds.append(code)
+        outcome = round_outcome(code)
+        self.user_score += SCORE_CHANGES[outcome]
+        self.current_game_finished = True
+        return outcome
+
+    def last_round(self):
+        """
+        Code of the most recently played round.
+        """
+        return self.rounds[-1]
+
+def deep_getsizeof(obj, seen=None):
+    """
+    Approximate the memory held by an object and everything it references.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if hasattr(obj, 'memory_usage') and hasattr(obj, 'index'):
+        # pandas objects report their own buffers
+        return int(obj.memory_usage(deep=True).sum() if hasattr(obj, 'columns') else obj.memory_usage(deep=True))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_getsizeof(key, seen) + deep_getsizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_getsizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(deep_getsizeof(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+if __name__ == '__main__':
+    # Compare the per-session state of a finished round: python -m utils.game_state
+    import os
+    import pandas as pd
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    df = pd.read_csv(os.path.join(script_dir, '..', 'data', 'bundesliga_matches.csv'))
+    random_game = df.iloc[0]
+
+    # Loose session state values as stored before GameState
+    legacy_state = {
+        'game_started': True,
+        'current_game_finished': True,
+        'user_score': 1,
+        'username': 'player_one',
+        'random_game': random_game,
+        'round_count': 3,
+        'user_prediction': 'Win',
+        'score_added': False,
+        'model_prediction_label': 'Not Win',
+        'user_prediction_label': 'Win',
+        'result_real_result': f"The real result: Team **{random_game['team']}** did **Win** the game!",
+        'result_score_message': SCORE_MESSAGES[Outcome.USER_ONLY_CORRECT],
+    }
+
+    game = GameState(username='player_one', game_started=True, round_count=3, schedule=(0, 17, 512, 901, 1203))
+    for user_win, model_win, real_win in [(True, False, True), (False, False, True), (True, False, True)]:
+        game.record_round(user_win, model_win, real_win)
+
+    legacy_bytes = deep_getsizeof(legacy_state)
+    game_bytes = deep_getsizeof(game)
+    print(f"Loose session state: {legacy_bytes:,} bytes")
+    print(f"GameState:           {game_bytes:,} bytes ({legacy_bytes / game_bytes:.1f}x smaller)")
@@ -1,18 +1,28 @@
 # utils/gsheets.py
 
-import gspread
-from google.oauth2.service_account import Credentials
 import streamlit as st
 import pandas as pd
-import os
-import sys
-from google.oauth2 import service_account
+from utils.scoreboard import SCOREBOARD_COLUMNS, ScoreboardBackend, ScoreboardCache
+from utils.metrics import timed
 
+# The scoreboard columns below the header
+SCOREBOARD_RANGE = f"A2:{chr(ord('A') + len(SCOREBOARD_COLUMNS) - 1)}"
+
+# Rows appended by other app processes that may follow our own when checking
+# whether a failed append went through
+STORED_CHECK_SLACK = 50
+
+@timed('init_gsheets')
 def init_gsheets():
     """
     Initialize the Google Sheets client using service account credentials.
     Returns the 'Scoreboard' worksheet.
     """
+    # Imported here so the app only loads them when this backend is used
+    import gspread
+    from google.oauth2 import service_account
+    from utils.sheets_client import shared_sheets_client
+
     # Define the scope
     scopes = [
         'https://www.googleapis.com/auth/spreadsheets',
@@ -20,18 +30,19 @@ def init_gsheets():
     ]
 
     # Create credentials using the service account info stored in Streamlit secrets
-    try:
-        credentials = service_account.Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=scopes
-        )
-    except Exception as e:
-        st.error(f"Error creating credentials: {e}")
-        st.stop()
+    def make_credentials():
+        try:
+            return service_account.Credentials.from_service_account_info(
+                st.secrets["gcp_service_account"],
+                scopes=scopes
+            )
+        except Exception as e:
+            st.error(f"Error creating credentials: {e}")
+            st.stop()
 
-    # Authorize the client
+    # Authorize the client, shared by every session of the process
     try:
-        client = gspread.authorize(credentials)
+        client = shared_sheets_client(make_credentials)
     except Exception as e:
         st.error(f"Error authorizing gspread client: {e}")
         st.stop()
@@ -48,38 +59,78 @@ def init_gsheets():
         st.error(f"Error opening Google Spreadsheet: {e}")
         st.stop()
 
-def save_scoreboard(sheet, scoreboard):
+def ensure_scoreboard_header(sheet):
     """
-    Save the scoreboard DataFrame to Google Sheets.
+    Write the scoreboard columns into the first row of an empty sheet.
+    A sheet holding anything else is left untouched.
     """
     try:
-        # Clear existing data except headers
-        sheet.resize(rows=1)
-        # Append all rows at once
-        rows = scoreboard.values.tolist()
-        sheet.append_rows(rows, value_input_option='RAW')
+        header = sheet.row_values(1)
+        if not header:
+            sheet.update([SCOREBOARD_COLUMNS], 'A1')
+        elif header[:len(SCOREBOARD_COLUMNS)] != SCOREBOARD_COLUMNS:
+            st.error(f"Unexpected scoreboard columns in Google Sheet: {header}. Expected {SCOREBOARD_COLUMNS}.")
     except Exception as e:
-        st.error(f"Error saving scoreboard to Google Sheets: {e}")
-        
-def load_scoreboard(sheet):
+        st.error(f"Error checking the scoreboard in Google Sheets: {e}")
+
+@timed('load_scoreboard')
+def fetch_scoreboard(sheet):
     """
-    Load the scoreboard from the Google Sheets.
+    Read the scoreboard from the sheet, raising on any error.
+    Only the scoreboard columns below the header are requested.
     Returns a sorted DataFrame.
     """
-    try:
-        records = sheet.get_all_records()
-        scoreboard = pd.DataFrame(records)
-        # Ensure columns exist
-        expected_columns = ['Username', 'Score']
-        for col in expected_columns:
-            if col not in scoreboard.columns:
-                st.warning(f"Column '{col}' missing in Google Sheet. Re-initializing the scoreboard.")
-                sheet.clear()
-                sheet.append_row(expected_columns)
-                return pd.DataFrame(columns=expected_columns)
-        # Sort the scoreboard descending by 'Score'
-        scoreboard = scoreboard.sort_values(by='Score', ascending=False).reset_index(drop=True)
-        return scoreboard
-    except Exception as e:
-        st.error(f"Error loading scoreboard from Google Sheets: {e}")
-        return pd.DataFrame(columns=['Username', 'Score'])
+    width = len(SCOREBOARD_COLUMNS)
+    values = sheet.get(SCOREBOARD_RANGE, value_render_option='UNFORMATTED_VALUE')
+    # The API leaves out trailing empty cells and rows
+    rows = [list(row) + [''] * (width - len(row)) for row in values if any(cell != '' for cell in row)]
+    if not rows:
+        return pd.DataFrame(columns=SCOREBOARD_COLUMNS)
+    scoreboard = pd.DataFrame(rows, columns=SCOREBOARD_COLUMNS)
+    scoreboard['Score'] = pd.to_numeric(scoreboard['Score'], errors='coerce').fillna(0).astype(int)
+    return scoreboard.sort_values(by='Score', ascending=False).reset_index(drop=True)
+
+class GSheetsBackend(ScoreboardBackend):
+    """
+    Scoreboard stored in a Google Sheets worksheet.
+    Reads go through a shared TTL cache holding a Leaderboard, so the query
+    methods work on the cached copy instead of calling the API.
+    """
+
+    def __init__(self, sheet):
+        self.sheet = sheet
+        ensure_scoreboard_header(sheet)
+        self.cache = ScoreboardCache(lambda: fetch_scoreboard(self.sheet))
+        super().__init__()
+
+    def leaderboard(self):
+        return self.cache.get()
+
+    def read(self):
+        return self.cache.get().to_frame()
+
+    @timed('save_scoreboard')
+    def write_rows(self, rows):
+        self.sheet.append_rows(rows, value_input_option='RAW', insert_data_option='INSERT_ROWS')
+
+    def write_rejected(self, error):
+        # Only a quota rejection is known to have left the sheet unchanged; a
+        # server or connection error may come after the rows were appended
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status_code', None) == 429
+
+    def rows_stored(self, rows):
+        """
+        Look for rows as one block among the last rows of the sheet, allowing
+        for rows appended by other processes after them.
+        """
+        values = self.sheet.get(SCOREBOARD_RANGE, value_render_option='UNFORMATTED_VALUE')
+        tail = [[str(cell) for cell in row] for row in values[-(len(rows) + STORED_CHECK_SLACK):]]
+        block = [[str(cell) for cell in row] for row in rows]
+        return any(tail[i:i + len(block)] == block for i in range(len(tail) - len(block) + 1))
+
+    def on_written(self, rows):
+        self.cache.add_rows(rows)
+
+    def stats(self):
+        return {**super().stats(), **self.cache.stats()}
@@ -1,31 +1,135 @@
 # utils/helpers.py
 
 import os
+import time
 import base64
+import threading
+from collections import OrderedDict
+import numpy as np
 import streamlit as st
-import plotly.graph_objects as go
+from utils.assets import LOGO_DIR, load_manifest, resolve_logo_path
+from utils.metrics import timed
 
+# Display-sized logo variants built by `python -m utils.assets`, if present
+logo_manifest = load_manifest()
+
+@timed('logo_encoding')
 def get_base64_encoded_image(image_path):
     """
     Encode an image to a base64 string.
+    Returns None if the image does not exist; callers warn about it, as this
+    may run outside a script run (e.g. on the prefetch threads).
     """
     try:
         with open(image_path, 'rb') as img_file:
             encoded_string = base64.b64encode(img_file.read()).decode()
         return encoded_string
     except FileNotFoundError:
-        st.warning(f"Image not found at path: {image_path}")
         return None
 
+def get_logo_path(name, logo_filename):
+    """
+    Get the path to the built variant of a logo, falling back to the
+    original file in logos/.
+    """
+    logo_path = os.path.join(LOGO_DIR, logo_filename)
+    return resolve_logo_path(name, logo_path, logo_manifest)
+
 def get_team_logo_path(team_name):
     """
     Get the path to a team's logo image.
     """
-    # Get the directory where the script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    logo_filename = f"{team_name}.png"
-    logo_path = os.path.join(script_dir, '..', 'logos', logo_filename)
-    return logo_path
+    return get_logo_path(team_name, f"{team_name}.png")
+
+class LogoCache:
+    """
+    Bounded LRU cache of base64-encoded logos keyed by name.
+    Entries are revalidated against the file mtime at most every
+    revalidate_after seconds. Missing logos are cached as None as well and
+    revalidated against the mtime of the logo directory.
+    """
+
+    def __init__(self, max_entries=64, revalidate_after=5.0):
+        self.max_entries = max_entries
+        self.revalidate_after = revalidate_after
+        self._entries = OrderedDict()  # name -> (path, mtime_ns, checked_at, encoded)
+        self._lock = threading.Lock()
+        self.warmed = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def get(self, name, path):
+        """
+        Return the base64-encoded logo at path, or None if it does not exist.
+        """
+        path = os.path.normpath(path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == path:
+                _, mtime, checked_at, encoded = entry
+                if now - checked_at < self.revalidate_after:
+                    self._entries.move_to_end(name)
+                    self.hits += 1
+                    return encoded
+                # A missing logo can only appear by adding a file to the directory
+                current_mtime = self._mtime(path if encoded is not None else LOGO_DIR)
+                if current_mtime == mtime:
+                    self._entries[name] = (path, mtime, now, encoded)
+                    self._entries.move_to_end(name)
+                    self.hits += 1
+                    return encoded
+            self.misses += 1
+
+        mtime = self._mtime(path)
+        encoded = get_base64_encoded_image(path)
+        if encoded is None:
+            mtime = self._mtime(LOGO_DIR)
+
+        with self._lock:
+            self._entries[name] = (path, mtime, now, encoded)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return encoded
+
+    def warm(self, logo_dir=LOGO_DIR):
+        """
+        Encode every logo in logo_dir, keyed by its file name without extension.
+        Only runs once per process.
+        """
+        if self.warmed:
+            return
+        self.warmed = True
+        file_names = [
+            file_name for file_name in sorted(os.listdir(logo_dir))
+            if os.path.isfile(os.path.join(logo_dir, file_name))
+        ]
+        for file_name in file_names[:self.max_entries]:
+            name, _ = os.path.splitext(file_name)
+            self.get(name, get_logo_path(name, file_name))
+
+# Shared by every session of the process
+logo_cache = LogoCache()
+
+def get_team_logo(team_name):
+    """
+    Get a team's base64-encoded logo from the cache.
+    """
+    return logo_cache.get(team_name, get_team_logo_path(team_name))
+
+def get_cached_image(name, image_path):
+    """
+    Get any base64-encoded image from the logo cache.
+    """
+    return logo_cache.get(name, image_path)
 
 def local_css():
     """
@@ -47,66 +151,80 @@ def local_css():
         unsafe_allow_html=True
     )
 
-def create_radar_chart(team_a_stats, team_b_stats, team_a_name, team_b_name, min_salary, max_salary):
+# Radar chart categories and the value that maps to 100 on the chart.
+# Salary Level is min-max scaled over the dataset instead.
+RADAR_MAX_VALUES = {
+    "Overall": 100,
+    "Attack": 100,
+    "Midfield": 100,
+    "Defense": 100,
+    "avg Goals Scored last 4 games": 6,        # Adjust based on realistic maximums
+    "avg xG last 4 games": 6,               # Adjust based on realistic maximums
+    "avg Possession last 4 games": 100,
+    "Salary Level": 100     # Since we normalize to 0-100
+}
+RADAR_CATEGORIES = list(RADAR_MAX_VALUES)
+
+# Match columns behind each radar category: (team column, opponent column)
+RADAR_COLUMNS = {
+    "Overall": ("team_overall", "opponent_overall"),
+    "Attack": ("team_attack", "opponent_attack"),
+    "Midfield": ("team_midfield", "opponent_midfield"),
+    "Defense": ("team_defense", "opponent_defense"),
+    "avg Goals Scored last 4 games": ("gf_last_4_games", "opponent_gf_last_4_games"),
+    "avg xG last 4 games": ("xg_last_4_games", "opponent_xg_last_4_games"),
+    "avg Possession last 4 games": ("poss_last_4_games", "opponent_poss_last_4_games"),
+    "Salary Level": ("team_salary", "opponent_team_salary"),
+}
+
+def normalize_radar_values(values, min_salary, max_salary):
     """
-    Creates a radar chart comparing statistics of two teams.
+    Scale radar stats to 0-100.
+    values is an array whose last axis follows RADAR_CATEGORIES.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    caps = np.array([RADAR_MAX_VALUES[category] for category in RADAR_CATEGORIES], dtype=np.float64)
+    normalized = values / caps * 100
+    # Use Min-Max Normalization for Salary Level
+    salary = RADAR_CATEGORIES.index("Salary Level")
+    normalized[..., salary] = (values[..., salary] - min_salary) / (max_salary - min_salary) * 100
+    return np.clip(normalized, 0, 100)
+
+def compute_radar_matrix(df, min_salary, max_salary):
     """
-    categories = list(team_a_stats.keys())
-
-    # Normalize the values to a 0-100 scale
-    max_values = {
-        "Overall": 100,
-        "Attack": 100,
-        "Midfield": 100,
-        "Defense": 100,
-        "avg Goals Scored last 4 games": 6,        # Adjust based on realistic maximums
-        "avg xG last 4 games": 6,               # Adjust based on realistic maximums
-        "avg Possession last 4 games": 100,
-        "Salary Level": 100     # Since we normalize to 0-100
-    }
-
-    # Normalize stats for both teams
-    def normalize_stats(stats):
-        normalized = []
-        for category in categories:
-            value = stats.get(category, 0)  # Use .get to handle missing keys
-            if category == 'Salary Level':
-                # Use Min-Max Normalization for Salary Level
-                normalized_value = ((value - min_salary) / (max_salary - min_salary)) * 100
-                normalized_value = max(0, min(normalized_value, 100))  # Clamp between 0 and 100
-            else:
-                max_value = max_values.get(category, 100)
-                normalized_value = (value / max_value) * 100
-                normalized_value = max(0, min(normalized_value, 100))  # Clamp between 0 and 100
-            normalized.append(normalized_value)
-        return normalized
-
-    team_a_values = normalize_stats(team_a_stats)
-    team_b_values = normalize_stats(team_b_stats)
+    Normalize the radar stats of every match in one pass.
+    Returns two float32 matrices (team, opponent) of shape (matches, categories).
+    """
+    team_columns = [RADAR_COLUMNS[category][0] for category in RADAR_CATEGORIES]
+    opponent_columns = [RADAR_COLUMNS[category][1] for category in RADAR_CATEGORIES]
+    team_values = normalize_radar_values(df[team_columns].to_numpy(dtype=np.float64), min_salary, max_salary)
+    opponent_values = normalize_radar_values(df[opponent_columns].to_numpy(dtype=np.float64), min_salary, max_salary)
+    return team_values.astype(np.float32), opponent_values.astype(np.float32)
+
+def build_radar_template():
+    """
+    Build the radar chart with its full layout and two empty traces.
+    """
+    # plotly is only needed once a game page is shown
+    import plotly.graph_objects as go
 
     # Close the loop for the radar chart
-    team_a_values += team_a_values[:1]
-    team_b_values += team_b_values[:1]
-    categories += categories[:1]
+    categories = RADAR_CATEGORIES + RADAR_CATEGORIES[:1]
 
     fig = go.Figure()
 
     # Add Team A to the radar chart
     fig.add_trace(go.Scatterpolar(
-        r=team_a_values,
         theta=categories,
         fill='toself',
-        name=team_a_name,
         line_color='blue',
         opacity=0.7
     ))
 
     # Add Team B to the radar chart
     fig.add_trace(go.Scatterpolar(
-        r=team_b_values,
         theta=categories,
         fill='toself',
-        name=team_b_name,
         line_color='red',
         opacity=0.7
     ))
@@ -137,4 +255,43 @@ def create_radar_chart(team_a_stats, team_b_stats, team_a_name, team_b_name, min
         ),
         margin=dict(l=50, r=50, t=50, b=50)
     )
-    return fig
\ No newline at end of file
+    return fig
+
+# Built on first use and copied for every chart
+radar_template = None
+
+@timed('create_radar_chart')
+def radar_figure(team_a_values, team_b_values, team_a_name, team_b_name):
+    """
+    Create a radar chart from already normalized values by filling in a copy
+    of the template.
+    """
+    import plotly.graph_objects as go
+
+    global radar_template
+    if radar_template is None:
+        radar_template = build_radar_template()
+    team_a_values = [float(value) for value in team_a_values]
+    team_b_values = [float(value) for value in team_b_values]
+
+    fig = go.Figure(radar_template)
+    with fig.batch_update():
+        # Close the loop for the radar chart
+        fig.data[0].r = team_a_values + team_a_values[:1]
+        fig.data[0].name = team_a_name
+        fig.data[1].r = team_b_values + team_b_values[:1]
+        fig.data[1].name = team_b_name
+    return fig
+
+def create_radar_chart(team_a_stats, team_b_stats, team_a_name, team_b_name, min_salary, max_salary):
+    """
+    Creates a radar chart comparing statistics of two teams.
+    """
+    # Use .get to handle missing keys
+    team_a_values = normalize_radar_values(
+        [team_a_stats.get(category, 0) for category in RADAR_CATEGORIES], min_salary, max_salary
+    )
+    team_b_values = normalize_radar_values(
+        [team_b_stats.get(category, 0) for category in RADAR_CATEGORIES], min_salary, max_salary
+    )
+    return radar_figure(team_a_values, team_b_values, team_a_name, team_b_name)
@@ -0,0 +1,196 @@
+# utils/leaderboard.py
+
+import bisect
+import itertools
+import threading
+import pandas as pd
+
+LEADERBOARD_COLUMNS = ['Rank', 'Username', 'Score']
+
+class Leaderboard:
+    """
+    Ordered in-memory leaderboard with a username index.
+    Entries are kept sorted by descending score (ties in insertion order) in
+    a list of buckets of roughly `load` entries, with a Fenwick tree over the
+    bucket sizes for positional lookups. Inserting and finding a rank take
+    O(log n) bisects plus a small in-bucket shift; username checks are a dict
+    lookup. Ranks are competition ranks: 1 + the number of strictly better scores.
+    """
+
+    def __init__(self, load=512):
+        self._load = load
+        self._buckets = []  # sorted lists of (-score, seq, username)
+        self._maxes = []  # last key of each bucket
+        self._tree = None  # Fenwick tree over bucket sizes, rebuilt after splits
+        self._best = {}  # username -> best key
+        self._seq = itertools.count()
+        self._size = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_rows(cls, rows, load=512):
+        """
+        Build a leaderboard from (Username, Score) rows in one sort.
+        """
+        leaderboard = cls(load)
+        keys = sorted((-int(score), next(leaderboard._seq), str(username)) for username, score in rows)
+        leaderboard._buckets = [keys[i:i + load] for i in range(0, len(keys), load)]
+        leaderboard._maxes = [bucket[-1] for bucket in leaderboard._buckets]
+        leaderboard._size = len(keys)
+        for key in keys:
+            leaderboard._index(key)
+        return leaderboard
+
+    @classmethod
+    def from_scoreboard(cls, scoreboard, load=512):
+        """
+        Build a leaderboard from a (Username, Score) DataFrame.
+        """
+        return cls.from_rows(zip(scoreboard['Username'], scoreboard['Score']), load)
+
+    def __len__(self):
+        return self._size
+
+    def _index(self, key):
+        username = key[2]
+        best = self._best.get(username)
+        if best is None or key < best:
+            self._best[username] = key
+
+    def _build_tree(self):
+        tree = [0] * (len(self._buckets) + 1)
+        for i, bucket in enumerate(self._buckets, start=1):
+            tree[i] += len(bucket)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, bucket_index, delta):
+        i = bucket_index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, bucket_index):
+        # Number of entries in the buckets before bucket_index
+        if self._tree is None:
+            self._build_tree()
+        total, i = 0, bucket_index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, position):
+        # Bucket index and offset of the entry at a 0-based position
+        if self._tree is None:
+            self._build_tree()
+        bucket_index, step = 0, 1 << len(self._tree).bit_length()
+        while step:
+            nxt = bucket_index + step
+            if nxt < len(self._tree) and self._tree[nxt] <= position:
+                bucket_index = nxt
+                position -= self._tree[nxt]
+            step >>= 1
+        return bucket_index, position
+
+    def add(self, username, score):
+        """
+        Insert a (Username, Score) entry.
+        """
+        key = (-int(score), next(self._seq), str(username))
+        with self._lock:
+            if not self._buckets:
+                self._buckets.append([key])
+                self._maxes.append(key)
+                self._tree = None
+            else:
+                i = min(bisect.bisect_left(self._maxes, key), len(self._buckets) - 1)
+                bucket = self._buckets[i]
+                bisect.insort(bucket, key)
+                self._maxes[i] = bucket[-1]
+                if len(bucket) > 2 * self._load:
+                    self._buckets[i:i + 1] = [bucket[:self._load], bucket[self._load:]]
+                    self._maxes[i:i + 1] = [bucket[self._load - 1], bucket[-1]]
+                    self._tree = None
+                elif self._tree is not None:
+                    self._tree_add(i, 1)
+            self._size += 1
+            self._index(key)
+
+    def add_rows(self, rows):
+        """
+        Insert several (Username, Score) rows.
+        """
+        for username, score in rows:
+            self.add(username, score)
+
+    def has_user(self, username):
+        """
+        Check whether a username is on the leaderboard.
+        """
+        return username in self._best
+
+    def _better_than(self, score):
+        # Number of entries with a strictly higher score
+        key = (-int(score),)
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._buckets):
+            return self._size
+        return self._prefix(i) + bisect.bisect_left(self._buckets[i], key)
+
+    def rank(self, username):
+        """
+        Return the rank of the user's best score, or None if not on the leaderboard.
+        """
+        with self._lock:
+            best = self._best.get(username)
+            if best is None:
+                return None
+            return self._better_than(-best[0]) + 1
+
+    def _rows(self, start, stop):
+        # Entries at positions [start, stop) with their competition ranks
+        start, stop = max(0, start), min(stop, self._size)
+        rows = []
+        if start >= stop:
+            return pd.DataFrame(rows, columns=LEADERBOARD_COLUMNS)
+        bucket_index, offset = self._locate(start)
+        rank_by_score = {}
+        for _ in range(stop - start):
+            while offset >= len(self._buckets[bucket_index]):
+                bucket_index, offset = bucket_index + 1, 0
+            neg_score, _, username = self._buckets[bucket_index][offset]
+            if neg_score not in rank_by_score:
+                rank_by_score[neg_score] = self._better_than(-neg_score) + 1
+            rows.append((rank_by_score[neg_score], username, -neg_score))
+            offset += 1
+        return pd.DataFrame(rows, columns=LEADERBOARD_COLUMNS)
+
+    def top(self, n, offset=0):
+        """
+        Return n entries starting at a 0-based offset, for paginated display.
+        """
+        with self._lock:
+            return self._rows(offset, offset + n)
+
+    def around(self, username, window=2):
+        """
+        Return the user's best entry with up to `window` entries on each side.
+        """
+        with self._lock:
+            best = self._best.get(username)
+            if best is None:
+                return pd.DataFrame(columns=LEADERBOARD_COLUMNS)
+            i = bisect.bisect_left(self._maxes, best)
+            position = self._prefix(i) + bisect.bisect_left(self._buckets[i], best)
+            return self._rows(position - window, position + window + 1)
+
+    def to_frame(self):
+        """
+        Return all entries as a (Username, Score) DataFrame sorted by descending score.
+        """
+        with self._lock:
+            rows = [(username, -neg_score) for bucket in self._buckets for neg_score, _, username in bucket]
+        return pd.DataFrame(rows, columns=['Username', 'Score'])
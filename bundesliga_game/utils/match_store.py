@@ -0,0 +1,160 @@
+# utils/match_store.py
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from utils.schema import MATCH_SCHEMA, apply_schema, memory_report
+
+MANIFEST_NAME = 'manifest.json'
+
+# Bump when the way columns are written changes; stores built with another
+# format or another MATCH_SCHEMA are rebuilt
+STORE_FORMAT = 1
+SCHEMA_SHA256 = hashlib.sha256(json.dumps(MATCH_SCHEMA, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _write_atomically(path, write, mode='wb', **open_kwargs):
+    """
+    Write a file through write(f) into a uniquely named temporary file next
+    to its final path and swap it in. Readers that still have the old file
+    memory-mapped are not affected, and processes building the store at the
+    same time never write into each other's temporary files.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            write(f)
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _save_array(path, array):
+    """
+    Write a .npy file atomically.
+    """
+    _write_atomically(path, lambda f: np.save(f, array, allow_pickle=False))
+
+def build_match_store(csv_path, store_dir):
+    """
+    Convert the match CSV into one .npy file per column.
+    Columns are cast to the declared schema first; numeric columns are stored
+    as they are, categorical and text columns as integer codes with their
+    categories kept in the manifest.
+    """
+    raw_df = pd.read_csv(csv_path)
+    raw_df = raw_df.drop(columns=[col for col in raw_df.columns if col.startswith('Unnamed')])
+    df = apply_schema(raw_df)
+    os.makedirs(store_dir, exist_ok=True)
+
+    columns = {}
+    for col in df.columns:
+        file_name = f"{col}.npy"
+        if pd.api.types.is_numeric_dtype(df[col]):
+            _save_array(os.path.join(store_dir, file_name), df[col].to_numpy())
+            columns[col] = {'kind': 'numeric', 'file': file_name}
+        else:
+            categorical = pd.Categorical(df[col])
+            codes_dtype = np.int16 if len(categorical.categories) < np.iinfo(np.int16).max else np.int32
+            _save_array(os.path.join(store_dir, file_name), categorical.codes.astype(codes_dtype))
+            columns[col] = {
+                'kind': 'category',
+                'file': file_name,
+                'categories': categorical.categories.tolist(),
+            }
+
+    # The manifest is written last, so a store without one is incomplete
+    manifest = {
+        'format': STORE_FORMAT,
+        'schema_sha256': SCHEMA_SHA256,
+        'source_mtime_ns': os.stat(csv_path).st_mtime_ns,
+        'rows': len(df),
+        'memory': memory_report(raw_df, df),
+        'columns': columns,
+    }
+    _write_atomically(
+        os.path.join(store_dir, MANIFEST_NAME),
+        lambda f: json.dump(manifest, f, ensure_ascii=False),
+        mode='w', encoding='utf-8'
+    )
+    return manifest
+
+def read_manifest(store_dir):
+    """
+    Read the store manifest, or return None if there is no complete store.
+    """
+    try:
+        with open(os.path.join(store_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def is_store_current(csv_path, store_dir):
+    """
+    Check that the store exists and was built from the current CSV, with the
+    current store format and schema.
+    """
+    manifest = read_manifest(store_dir)
+    return (
+        manifest is not None
+        and manifest.get('format') == STORE_FORMAT
+        and manifest.get('schema_sha256') == SCHEMA_SHA256
+        and manifest['source_mtime_ns'] == os.stat(csv_path).st_mtime_ns
+    )
+
+def load_match_store(store_dir, columns=None):
+    """
+    Load the requested columns from the store as a DataFrame.
+    Numeric columns are memory-mapped, so only the pages that are actually
+    read end up in memory. Category codes are copied into the Categorical,
+    which is small: one small integer per row for the few text columns.
+    """
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No match store found in '{store_dir}'.")
+    if columns is None:
+        columns = list(manifest['columns'])
+
+    data = {}
+    for col in columns:
+        info = manifest['columns'][col]
+        array = np.load(os.path.join(store_dir, info['file']), mmap_mode='r')
+        if info['kind'] == 'category':
+            data[col] = pd.Categorical.from_codes(array, categories=info['categories'])
+        else:
+            data[col] = array
+    return pd.DataFrame(data, copy=False)
+
+def load_matches(csv_path, store_dir, columns=None):
+    """
+    Load the match data from the columnar store, (re)building the store first
+    when it is missing, older than the CSV or built with another schema.
+    Falls back to reading the CSV if the store cannot be written.
+    """
+    if not is_store_current(csv_path, store_dir):
+        try:
+            build_match_store(csv_path, store_dir)
+        except OSError:
+            return apply_schema(pd.read_csv(csv_path, usecols=columns))
+    return load_match_store(store_dir, columns)
+
+if __name__ == '__main__':
+    # Build the store from the CSV: python -m utils.match_store
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(script_dir, '..', 'data')
+    manifest = build_match_store(
+        os.path.join(data_dir, 'bundesliga_matches.csv'),
+        os.path.join(data_dir, 'match_store')
+    )
+    memory = manifest['memory']
+    print(f"Wrote {len(manifest['columns'])} columns for {manifest['rows']} matches.")
+    print(
+        f"Memory: {memory['before_bytes']:,} bytes with inferred dtypes, "
+        f"{memory['after_bytes']:,} bytes with the schema ({memory['saved_pct']}% saved)."
+    )
@@ -0,0 +1,215 @@
+# utils/metrics.py
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from utils.match_store import _write_atomically
+
+# Timing is switched on with APP_METRICS=1 before the app starts. When it is
+# off, timed() returns functions unchanged and phase() a shared no-op, so the
+# hooks cost nothing.
+ENABLED = os.environ.get('APP_METRICS') == '1'
+
+# Where export() writes the Prometheus text file, and how often. The default
+# name holds the process ID, so app replicas on one host keep separate files;
+# set APP_METRICS_FILE per replica to choose the path.
+EXPORT_PATH = os.environ.get(
+    'APP_METRICS_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', f"metrics.{os.getpid()}.prom")
+)
+EXPORT_INTERVAL = 5.0
+
+_NO_TIMING = nullcontext()
+
+class LatencyRecorder:
+    """
+    Keeps the most recent latency samples and reports their percentiles.
+    """
+
+    def __init__(self, max_samples=1000):
+        self._samples = deque(maxlen=max_samples)
+
+    def record(self, seconds):
+        """
+        Add a latency sample in seconds.
+        """
+        self._samples.append(seconds)
+
+    def stats(self):
+        """
+        Return the sample count and p50/p95/p99 in milliseconds.
+        """
+        if not self._samples:
+            return {'count': 0}
+        samples_ms = np.array(self._samples) * 1000
+        p50, p95, p99 = np.percentile(samples_ms, [50, 95, 99])
+        return {
+            'count': len(samples_ms),
+            'p50_ms': round(float(p50), 2),
+            'p95_ms': round(float(p95), 2),
+            'p99_ms': round(float(p99), 2),
+        }
+
+class PhaseMetrics:
+    """
+    Per-process durations of named phases (p50/p95/p99 over recent calls,
+    plus total count and time), and the phases timed during the current
+    rerun of each script thread.
+    """
+
+    def __init__(self):
+        self._recorders = {}
+        self._totals = {}  # phase -> [count, seconds]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._exported_at = 0.0
+        self.last_export_error = None
+
+    def record(self, phase, seconds):
+        """
+        Add one duration of a phase.
+        """
+        with self._lock:
+            recorder = self._recorders.get(phase)
+            if recorder is None:
+                recorder = self._recorders[phase] = LatencyRecorder()
+                self._totals[phase] = [0, 0.0]
+            totals = self._totals[phase]
+            totals[0] += 1
+            totals[1] += seconds
+        recorder.record(seconds)
+        rerun = getattr(self._local, 'rerun', None)
+        if rerun is not None:
+            rerun.append((phase, seconds))
+
+    def start_rerun(self):
+        """
+        Start collecting the phases timed by this thread for the debug panel.
+        """
+        self._local.rerun = []
+
+    def rerun_timings(self):
+        """
+        Return the (phase, seconds) pairs timed by this thread since start_rerun().
+        """
+        return list(getattr(self._local, 'rerun', None) or [])
+
+    def stats(self):
+        """
+        Return the count, total and percentiles of every phase.
+        """
+        with self._lock:
+            phases = sorted(self._recorders)
+            totals = {phase: tuple(self._totals[phase]) for phase in phases}
+        return {
+            phase: dict(self._recorders[phase].stats(), total_count=totals[phase][0], total_s=round(totals[phase][1], 6))
+            for phase in phases
+        }
+
+    def to_prometheus(self):
+        """
+        Render the phase durations in the Prometheus text format, as a summary
+        in seconds per phase, labelled with the process ID.
+        """
+        pid = os.getpid()
+        lines = [
+            '# HELP app_phase_seconds Time spent in each phase of the app.',
+            '# TYPE app_phase_seconds summary',
+        ]
+        for phase, stats in self.stats().items():
+            for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                if key in stats:
+                    lines.append(f'app_phase_seconds{{phase="{phase}",pid="{pid}",quantile="{quantile}"}} {stats[key] / 1000:.6f}')
+            lines.append(f'app_phase_seconds_sum{{phase="{phase}",pid="{pid}"}} {stats["total_s"]:.6f}')
+            lines.append(f'app_phase_seconds_count{{phase="{phase}",pid="{pid}"}} {stats["total_count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path=EXPORT_PATH, interval=EXPORT_INTERVAL):
+        """
+        Write the Prometheus text file, at most once every interval seconds.
+        A failed write is kept in last_export_error rather than raised, as
+        this runs at the end of every rerun.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._exported_at < interval:
+                return False
+            self._exported_at = now
+        text = self.to_prometheus()
+        try:
+            _write_atomically(path, lambda f: f.write(text), mode='w', encoding='utf-8')
+        except OSError as e:
+            self.last_export_error = e
+            return False
+        return True
+
+    def serve(self, port, host='127.0.0.1'):
+        """
+        Serve the Prometheus text on http://host:port/metrics from a daemon thread.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+        return server
+
+# Shared by every session of the process
+metrics = PhaseMetrics()
+
+def timed(phase):
+    """
+    Decorator that records the duration of every call under a phase name.
+    """
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metrics.record(phase, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+class _PhaseTimer:
+    __slots__ = ('phase', 'start')
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        metrics.record(self.phase, time.perf_counter() - self.start)
+
+def phase(name):
+    """
+    Context manager that records the duration of a block under a phase name.
+    """
+    return _PhaseTimer(name) if ENABLED else _NO_TIMING
@@ -0,0 +1,54 @@
+# utils/predictions.py
+
+import numpy as np
+import pandas as pd
+
+def precompute_predictions(df, model, model_features):
+    """
+    Run the model over every match in one vectorized batch.
+    Returns the predicted labels (int8) and the win probabilities (float32),
+    both indexed by row position in df.
+    """
+    model_input_df = df[model_features]
+    labels = model.predict(model_input_df).astype(np.int8)
+    win_column = list(model.classes_).index(1)
+    win_probabilities = model.predict_proba(model_input_df)[:, win_column].astype(np.float32)
+    return labels, win_probabilities
+
+def verify_predictions(df, model, model_features, labels, rows=None):
+    """
+    Check that the batched labels match the per-row model.predict output.
+    Checks every row unless a list of row positions is given.
+    Returns the row positions that disagree.
+    """
+    if rows is None:
+        rows = range(len(df))
+    mismatches = []
+    for row in rows:
+        model_input_df = pd.DataFrame([df.iloc[row][model_features]], columns=model_features)
+        if model.predict(model_input_df)[0] != labels[row]:
+            mismatches.append(row)
+    return mismatches
+
+def lookup_prediction(labels, win_probabilities, row):
+    """
+    Get the precomputed model label and win probability for a match row.
+    """
+    return int(labels[row]), float(win_probabilities[row])
+
+if __name__ == '__main__':
+    # Full check of the batched predictions against per-row predictions:
+    # python -m utils.predictions
+    import os
+    import joblib
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    df = pd.read_csv(os.path.join(script_dir, '..', 'data', 'bundesliga_matches.csv'))
+    model = joblib.load(os.path.join(script_dir, '..', 'data', 'best_lr_model.pkl'))
+    model_features = list(model.feature_names_in_)
+
+    labels, win_probabilities = precompute_predictions(df, model, model_features)
+    mismatches = verify_predictions(df, model, model_features, labels)
+    print(f"Checked {len(df)} rows, {len(mismatches)} mismatches.")
+    if mismatches:
+        raise SystemExit(f"Mismatching rows: {mismatches}")
@@ -0,0 +1,63 @@
+# utils/prefetch.py
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class Prefetcher:
+    """
+    Prepares results in a small thread pool ahead of time.
+    Results are keyed (e.g. by match row) and shared by every session, so a
+    round prepared for one player is ready for all of them.
+    """
+
+    def __init__(self, max_workers=2, max_entries=128):
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+        self.ready = 0  # get() found a finished result
+        self.waited = 0  # get() waited for a running prefetch
+        self.missed = 0  # get() had to compute the result itself
+
+    def submit(self, key, fn, *args):
+        """
+        Start computing fn(*args) in the background unless key is already known.
+        """
+        with self._lock:
+            if key in self._futures:
+                self._futures.move_to_end(key)
+                return self._futures[key]
+            future = self._executor.submit(fn, *args)
+            self._futures[key] = future
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+            return future
+
+    def get(self, key, fn, *args):
+        """
+        Return the prefetched result for key, computing it now if it was
+        never submitted or its prefetch failed.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+        if future is None:
+            self.missed += 1
+            return self.submit(key, fn, *args).result()
+        if future.done():
+            self.ready += 1
+        else:
+            self.waited += 1
+        try:
+            return future.result()
+        except Exception:
+            with self._lock:
+                self._futures.pop(key, None)
+            self.missed += 1
+            return fn(*args)
+
+    def stats(self):
+        """
+        Return how often results were ready, waited for or computed on demand.
+        """
+        return {'ready': self.ready, 'waited': self.waited, 'missed': self.missed}
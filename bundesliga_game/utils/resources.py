@@ -0,0 +1,77 @@
+# utils/resources.py
+
+import os
+import threading
+
+class ResourceRegistry:
+    """
+    Process-wide cache for resources loaded from files.
+    Streamlit only re-executes the main script on a rerun, so an instance kept
+    in an imported module is shared by every session of the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # The counters have their own lock, so a hit never waits for a load
+        self._stats_lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _signature(paths):
+        # Only stat the files, never read them
+        signature = []
+        for path in paths:
+            try:
+                signature.append(os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def get(self, name, paths, loader):
+        """
+        Return the cached resource for name, calling loader() when it is not
+        cached yet or when the mtime of one of paths has changed.
+        The new value replaces the old one in a single step, so readers see
+        either the old or the new resource, never a mix.
+        """
+        signature = self._signature(paths)
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == signature:
+            self._count_hit()
+            return entry[1]
+
+        with self._lock:
+            # Another session may have reloaded while we waited for the lock
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == signature:
+                self._count_hit()
+                return entry[1]
+            with self._stats_lock:
+                self.misses += 1
+            value = loader()
+            self._entries[name] = (signature, value)
+            return value
+
+    def _count_hit(self):
+        with self._stats_lock:
+            self.hits += 1
+
+    def clear(self):
+        """
+        Drop all cached resources.
+        """
+        with self._lock:
+            self._entries = {}
+
+    def stats(self):
+        """
+        Return the hit/miss counters and the names of the cached resources.
+        """
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        return {'hits': hits, 'misses': misses, 'cached': sorted(self._entries)}
+
+# Shared by every session of the process
+registry = ResourceRegistry()
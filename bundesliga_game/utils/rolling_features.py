@@ -0,0 +1,166 @@
+# utils/rolling_features.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Number of previous matches averaged by the *_last_4_games columns
+WINDOW = 4
+
+# Per-match stats with a rolling column; each row holds them for the team
+# ('gf') and, prefixed with 'opponent_', for its opponent ('opponent_gf')
+MATCH_STATS = ['gf', 'ga', 'xg', 'xga', 'poss', 'sh', 'sot', 'dist', 'fk', 'pk', 'pkatt']
+ROLLING_STATS = MATCH_STATS + ['avg_points']
+
+# Points of the team and of its opponent for each result
+POINTS = {'W': (3, 0), 'D': (1, 1), 'L': (0, 3)}
+
+def rolling_columns(prefix=''):
+    """
+    Names of the rolling columns of one side of a match, e.g. prefix='opponent_'.
+    """
+    return [f"{prefix}{stat}_last_{WINDOW}_games" for stat in ROLLING_STATS]
+
+class TeamForm:
+    """
+    Ring buffer with the stats of a team's last WINDOW matches of a season.
+    """
+    __slots__ = ('season', 'values', 'count', 'position')
+
+    def __init__(self, season):
+        self.season = season
+        self.values = np.full((WINDOW, len(ROLLING_STATS)), np.nan)
+        self.count = 0
+        self.position = 0
+
+    def averages(self):
+        """
+        Mean of each stat over the buffered matches, skipping missing values.
+        Stats without any value (e.g. before the first match) are 0.
+        """
+        filled = self.values[:self.count]
+        present = ~np.isnan(filled)
+        counts = present.sum(axis=0)
+        sums = np.where(present, filled, 0.0).sum(axis=0)
+        return np.divide(sums, counts, out=np.zeros(len(ROLLING_STATS)), where=counts > 0)
+
+    def push(self, stats):
+        """
+        Add the stats of a played match, replacing the oldest one once full.
+        """
+        self.values[self.position] = stats
+        self.position = (self.position + 1) % WINDOW
+        self.count = min(self.count + 1, WINDOW)
+
+class RollingFeatureBuilder:
+    """
+    Keeps every team's recent form and fills in the rolling columns of new
+    matches, one match at a time.
+    Matches must be added in date order. Each is a row from the home team's
+    point of view with the raw stats of both sides (gf, opponent_gf, ...)
+    and the result; form is reset at the start of each season.
+    """
+
+    def __init__(self):
+        self.teams = {}
+
+    def _form(self, team, season):
+        form = self.teams.get(team)
+        if form is None or form.season != season:
+            form = self.teams[team] = TeamForm(season)
+        return form
+
+    def add_match(self, match):
+        """
+        Return a copy of the match with the rolling columns of both teams,
+        computed from their matches before this one, then record the match.
+        """
+        team_form = self._form(match['team'], match['season'])
+        opponent_form = self._form(match['opponent'], match['season'])
+
+        row = dict(match)
+        row.update(zip(rolling_columns(), team_form.averages().tolist()))
+        row.update(zip(rolling_columns('opponent_'), opponent_form.averages().tolist()))
+
+        team_points, opponent_points = POINTS[match['result']]
+        team_form.push([match[stat] for stat in MATCH_STATS] + [team_points])
+        opponent_form.push([match[f"opponent_{stat}"] for stat in MATCH_STATS] + [opponent_points])
+        return row
+
+    def add_matches(self, matches):
+        """
+        Add the rows of a DataFrame in date order.
+        Returns them with the rolling columns, in their original order.
+        """
+        order = np.argsort(pd.to_datetime(matches['date']).to_numpy(), kind='stable')
+        records = matches.to_dict('records')
+        rows = [None] * len(records)
+        for i in order:
+            rows[i] = self.add_match(records[i])
+        return pd.DataFrame(rows, index=matches.index, columns=list(dict.fromkeys(list(matches.columns) + rolling_columns() + rolling_columns('opponent_'))))
+
+def rebuild_rolling_features(df):
+    """
+    Recompute every rolling column of a match DataFrame from its raw stats.
+    Returns the builder with each team's current form and the rebuilt DataFrame.
+    """
+    builder = RollingFeatureBuilder()
+    return builder, builder.add_matches(df)
+
+def compare_rolling_features(expected, rebuilt):
+    """
+    Count the rows where a rebuilt rolling column differs from the expected one.
+    """
+    columns = rolling_columns() + rolling_columns('opponent_')
+    return {
+        column: int((~np.isclose(rebuilt[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float))).sum())
+        for column in columns
+    }
+
+def append_matches(csv_path, new_matches):
+    """
+    Add new matches, all played after the existing ones, to the match CSV
+    with their rolling columns filled in.
+    The existing matches are replayed once to restore every team's form;
+    each new match then costs a constant amount of work.
+    Returns the appended rows.
+    """
+    existing = pd.read_csv(csv_path)
+    builder, _ = rebuild_rolling_features(existing)
+    appended = builder.add_matches(new_matches)
+
+    # Keep the CSV's column layout, continuing its unnamed index column
+    index_column = existing.columns[0] if existing.columns[0].startswith('Unnamed') else None
+    if index_column is not None:
+        appended[index_column] = np.arange(len(existing), len(existing) + len(appended))
+    appended = appended.reindex(columns=existing.columns)
+    appended.to_csv(csv_path, mode='a', header=False, index=False)
+    return appended
+
+if __name__ == '__main__':
+    # Rebuild and check the rolling columns: python -m utils.rolling_features
+    # Append new matches:                    python -m utils.rolling_features --append new.csv
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Rebuild or extend the rolling last-4-games features.")
+    parser.add_argument('--append', metavar='CSV', help="raw matches to append to the dataset")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_path = os.path.join(script_dir, '..', 'data', 'bundesliga_matches.csv')
+
+    if args.append:
+        appended = append_matches(data_path, pd.read_csv(args.append))
+        print(f"Appended {len(appended)} matches to data/bundesliga_matches.csv")
+    else:
+        df = pd.read_csv(data_path)
+        start = time.perf_counter()
+        _, rebuilt = rebuild_rolling_features(df)
+        elapsed = time.perf_counter() - start
+        mismatches = compare_rolling_features(df, rebuilt)
+        print(f"Rebuilt {len(mismatches)} rolling columns for {len(df)} matches in {elapsed:.3f}s "
+              f"({elapsed / len(df) * 1e6:.0f} µs per match), {sum(mismatches.values())} mismatching values.")
+        if any(mismatches.values()):
+            raise SystemExit({column: count for column, count in mismatches.items() if count})
@@ -0,0 +1,38 @@
+# utils/schedule.py
+
+import numpy as np
+import pandas as pd
+
+# Number of matches played in one game
+ROUNDS_PER_GAME = 5
+
+def build_strata(df, column):
+    """
+    Group the row positions of df by the values of a column (e.g. 'result'
+    or 'season'). Returns a list of integer arrays, one per value.
+    """
+    codes, _ = pd.factorize(df[column])
+    return [np.flatnonzero(codes == code) for code in range(codes.max() + 1)]
+
+def draw_schedule(row_count, rounds=ROUNDS_PER_GAME, strata=None, rng=None):
+    """
+    Draw the row positions of the matches for one game, without repeats.
+    With strata, the rounds are spread over the groups in turn, so a game
+    covers as many different results or seasons as possible.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    if strata is None:
+        return rng.choice(row_count, size=min(rounds, row_count), replace=False).tolist()
+
+    # Visit the groups in a random order, drawing one match from each in turn
+    groups = [rng.permutation(group).tolist() for group in strata if len(group)]
+    rng.shuffle(groups)
+    schedule = []
+    while len(schedule) < rounds and groups:
+        for group in list(groups):
+            if len(schedule) == rounds:
+                break
+            schedule.append(group.pop())
+            if not group:
+                groups.remove(group)
+    return schedule
@@ -0,0 +1,78 @@
+# utils/schema.py
+
+# Declared dtypes for the match data. Ratings, counts and hours fit in small
+# integers, per-game stats and rolling averages in float32, and repeated text
+# is stored as categoricals. Columns not listed keep the inferred dtype, and
+# integer columns with missing values (a new season without an hour or an
+# attendance yet) keep it too, since NaN does not fit a plain integer.
+MATCH_SCHEMA = {
+    # Match information
+    "date": "category",
+    "comp": "category",
+    "round": "category",
+    "day": "category",
+    "venue": "category",
+    "result": "category",
+    "captain": "category",
+    "opponent_captain": "category",
+    "home_team_formation": "category",
+    "away_team_formation": "category",
+    "referee": "category",
+    "season": "int16",
+    "team": "category",
+    "opponent": "category",
+    "datetime": "category",
+    "hour": "int8",
+    "attendance": "int32",
+
+    # Per-game stats
+    "gf": "int8", "ga": "int8", "xg": "float32", "xga": "float32", "poss": "int8",
+    "opponent_gf": "int8", "opponent_ga": "int8", "opponent_xg": "float32",
+    "opponent_xga": "float32", "opponent_poss": "int8",
+    "sh": "int8", "sot": "int8", "dist": "float32", "fk": "float32", "pk": "int8", "pkatt": "int8",
+    "opponent_sh": "int8", "opponent_sot": "int8", "opponent_dist": "float32",
+    "opponent_fk": "float32", "opponent_pk": "int8", "opponent_pkatt": "int8",
+
+    # Salaries and ratings
+    "team_salary": "int32",
+    "opponent_team_salary": "int32",
+    "team_overall": "int8", "team_attack": "int8", "team_midfield": "int8", "team_defense": "int8",
+    "opponent_overall": "int8", "opponent_attack": "int8", "opponent_midfield": "int8", "opponent_defense": "int8",
+
+    # Rolling averages over the last 4 games
+    "gf_last_4_games": "float32", "ga_last_4_games": "float32",
+    "xg_last_4_games": "float32", "xga_last_4_games": "float32",
+    "avg_points_last_4_games": "float32", "poss_last_4_games": "float32",
+    "sh_last_4_games": "float32", "sot_last_4_games": "float32",
+    "dist_last_4_games": "float32", "fk_last_4_games": "float32",
+    "pk_last_4_games": "float32", "pkatt_last_4_games": "float32",
+    "opponent_gf_last_4_games": "float32", "opponent_ga_last_4_games": "float32",
+    "opponent_xg_last_4_games": "float32", "opponent_xga_last_4_games": "float32",
+    "opponent_avg_points_last_4_games": "float32", "opponent_poss_last_4_games": "float32",
+    "opponent_sh_last_4_games": "float32", "opponent_sot_last_4_games": "float32",
+    "opponent_dist_last_4_games": "float32", "opponent_fk_last_4_games": "float32",
+    "opponent_pk_last_4_games": "float32", "opponent_pkatt_last_4_games": "float32",
+}
+
+def apply_schema(df):
+    """
+    Cast the columns of df to the declared dtypes, leaving integer columns
+    that have missing values as they are.
+    """
+    dtypes = {
+        col: dtype for col, dtype in MATCH_SCHEMA.items()
+        if col in df.columns and not (dtype.startswith('int') and df[col].isna().any())
+    }
+    return df.astype(dtypes)
+
+def memory_report(before, after):
+    """
+    Compare the memory used by two versions of the match DataFrame.
+    """
+    before_bytes = int(before.memory_usage(deep=True).sum())
+    after_bytes = int(after.memory_usage(deep=True).sum())
+    return {
+        'before_bytes': before_bytes,
+        'after_bytes': after_bytes,
+        'saved_pct': round(100 * (1 - after_bytes / before_bytes), 1) if before_bytes else 0.0,
+    }
@@ -0,0 +1,402 @@
+# utils/scoreboard.py
+
+import os
+import time
+import atexit
+import sqlite3
+import threading
+import streamlit as st
+import pandas as pd
+from utils.leaderboard import Leaderboard, LEADERBOARD_COLUMNS
+from utils.metrics import timed
+
+SCOREBOARD_COLUMNS = ['Username', 'Score']
+
+class ScoreboardWriter:
+    """
+    Background writer that appends new scoreboard rows to a backend.
+    Rows submitted by concurrent sessions are coalesced into one write_rows
+    call per flush; a row submitted while nothing else is queued is written
+    straight away. Rows are only dropped from the queue once the write has
+    succeeded; failed flushes are retried with backoff. A failure that
+    is_rejected() does not vouch for may have been applied anyway, so before
+    sending such a batch again the writer asks is_stored() whether its rows
+    are already there.
+    """
+
+    def __init__(self, write_rows, flush_interval=0.5, max_batch=200, max_backoff=30.0, on_written=None,
+                 is_rejected=None, is_stored=None):
+        self.write_rows = write_rows
+        self.is_rejected = is_rejected or (lambda error: True)
+        self.is_stored = is_stored or (lambda rows: False)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_backoff = max_backoff
+        self.on_written = on_written
+        self._pending = []  # (row, done_event)
+        self._condition = threading.Condition()
+        self._thread = None
+        self.flushes = 0
+        self.rows_written = 0
+        self.last_error = None
+        atexit.register(self.flush, timeout=10)
+
+    def submit(self, username, score):
+        """
+        Queue a (Username, Score) row for the next flush.
+        Returns an event that is set once the row has been written.
+        """
+        done = threading.Event()
+        with self._condition:
+            self._pending.append(([username, score], done))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='scoreboard-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return done
+
+    def _run(self):
+        backoff = self.flush_interval
+        batch = None
+        unverified = False  # the last write of batch failed and may have been applied
+        while True:
+            if batch is None:
+                with self._condition:
+                    while not self._pending:
+                        self._condition.wait()
+                    queued = len(self._pending)
+                # A lone row is written at once; when other sessions' rows are already
+                # queued, give those finishing at the same moment a chance to join the batch
+                if queued > 1:
+                    time.sleep(self.flush_interval)
+                with self._condition:
+                    batch = self._pending[:self.max_batch]
+            rows = [row for row, _ in batch]
+            stored = False
+            try:
+                if unverified:
+                    stored = self.is_stored(rows)
+                    unverified = False
+                if not stored:
+                    try:
+                        self.write_rows(rows)
+                    except Exception as e:
+                        unverified = not self.is_rejected(e)
+                        raise
+            except Exception as e:
+                self.last_error = e
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            backoff = self.flush_interval
+            with self._condition:
+                del self._pending[:len(batch)]
+                self.flushes += 1
+                self.rows_written += len(batch)
+            if self.on_written is not None:
+                self.on_written(rows)
+            for _, done in batch:
+                done.set()
+            batch = None
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued row has been written.
+        Returns False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                if not self._pending:
+                    return True
+                last_done = self._pending[-1][1]
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            last_done.wait(remaining)
+
+class ScoreboardCache:
+    """
+    Time-bounded scoreboard cache shared by every session of the process.
+    Reads within ttl seconds are served from memory. Once the entry expires
+    it is refreshed in the background; if fetch() does not answer within
+    stale_wait seconds the previous scoreboard is served instead. The cached
+    copy is kept as a Leaderboard, so rows we wrote ourselves are inserted
+    into it in O(log n).
+    """
+
+    def __init__(self, fetch, ttl=30.0, stale_wait=2.0):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_wait = stale_wait
+        self._scoreboard = None
+        self._loaded_at = 0.0
+        self._version = 0
+        self._refresh_thread = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.remote_reads = 0
+        self.stale_served = 0
+        self.patches = 0
+        self.last_error = None
+
+    def get(self):
+        """
+        Return the scoreboard as a Leaderboard, fetching it only when the
+        cached copy has expired.
+        """
+        with self._lock:
+            if self._scoreboard is not None and time.monotonic() - self._loaded_at < self.ttl:
+                self.hits += 1
+                return self._scoreboard
+            if self._scoreboard is None:
+                # Nothing to fall back to, read synchronously
+                self.remote_reads += 1
+                try:
+                    self._scoreboard = Leaderboard.from_scoreboard(self.fetch())
+                except Exception as e:
+                    self.last_error = e
+                    st.error(f"Error loading scoreboard: {e}")
+                    return Leaderboard()
+                self._loaded_at = time.monotonic()
+                return self._scoreboard
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_thread = threading.Thread(target=self._refresh, name='scoreboard-refresh', daemon=True)
+                self._refresh_thread.start()
+            refresh_thread = self._refresh_thread
+
+        refresh_thread.join(self.stale_wait)
+        with self._lock:
+            if time.monotonic() - self._loaded_at >= self.ttl:
+                self.stale_served += 1
+            return self._scoreboard
+
+    def _refresh(self):
+        with self._lock:
+            version = self._version
+            self.remote_reads += 1
+        try:
+            scoreboard = Leaderboard.from_scoreboard(self.fetch())
+        except Exception as e:
+            self.last_error = e
+            return
+        with self._lock:
+            # Drop the result if one of our writes was patched in meanwhile
+            if version == self._version:
+                self._scoreboard = scoreboard
+                self._loaded_at = time.monotonic()
+
+    def add_rows(self, rows):
+        """
+        Patch rows that were just written into the cached copy.
+        """
+        with self._lock:
+            self._version += 1
+            self.patches += 1
+            if self._scoreboard is not None:
+                self._scoreboard.add_rows(rows)
+
+    def invalidate(self):
+        """
+        Force the next read to fetch the scoreboard.
+        """
+        with self._lock:
+            self._version += 1
+            self._loaded_at = 0.0
+
+    def stats(self):
+        """
+        Return the read counters; reads_saved counts reads served without fetching.
+        """
+        return {
+            'hits': self.hits,
+            'stale_served': self.stale_served,
+            'remote_reads': self.remote_reads,
+            'patches': self.patches,
+            'reads_saved': self.hits + self.stale_served,
+        }
+
+class ScoreboardBackend:
+    """
+    Storage for the (Username, Score) scoreboard.
+    Subclasses implement read() and write_rows(); the query methods have
+    default implementations on top of read() that backends can replace with
+    cheaper ones.
+    """
+
+    def __init__(self):
+        self.writer = ScoreboardWriter(
+            self.write_rows, on_written=self.on_written,
+            is_rejected=self.write_rejected, is_stored=self.rows_stored
+        )
+
+    def read(self):
+        """
+        Return the whole scoreboard as a DataFrame sorted by descending score.
+        """
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        """
+        Append (Username, Score) rows, raising on failure.
+        """
+        raise NotImplementedError
+
+    def write_rejected(self, error):
+        """
+        Whether a write_rows error guarantees that nothing was written, so the
+        rows can simply be sent again. Writes are transactional by default.
+        """
+        return True
+
+    def rows_stored(self, rows):
+        """
+        Whether rows from a write that failed ambiguously are already stored.
+        """
+        return False
+
+    def on_written(self, rows):
+        """
+        Called by the writer after rows have been written.
+        """
+
+    def leaderboard(self):
+        """
+        Return the scoreboard as a Leaderboard.
+        """
+        return Leaderboard.from_scoreboard(self.read())
+
+    def count(self):
+        """
+        Return the number of entries.
+        """
+        return len(self.leaderboard())
+
+    def top(self, n, offset=0):
+        """
+        Return n (Rank, Username, Score) entries starting at a 0-based offset.
+        """
+        return self.leaderboard().top(n, offset)
+
+    def around(self, username, window=2):
+        """
+        Return the user's best entry with up to `window` entries on each side.
+        """
+        return self.leaderboard().around(username, window)
+
+    def rank(self, username):
+        """
+        Return the 1-based rank of the user's best score, or None if the user
+        is not on the scoreboard.
+        """
+        return self.leaderboard().rank(username)
+
+    def has_user(self, username):
+        """
+        Check whether a username is already on the scoreboard.
+        """
+        return self.leaderboard().has_user(username)
+
+    def stats(self):
+        """
+        Return backend counters.
+        """
+        return {'rows_written': self.writer.rows_written, 'flushes': self.writer.flushes}
+
+class SQLiteBackend(ScoreboardBackend):
+    """
+    Scoreboard stored in a local SQLite database, indexed on score and username
+    so top-N, rank and username lookups never load the whole table.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS scoreboard ('
+                'id INTEGER PRIMARY KEY, username TEXT NOT NULL, score INTEGER NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_scoreboard_score ON scoreboard (score DESC, id)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_scoreboard_username ON scoreboard (username)')
+        super().__init__()
+
+    @timed('load_scoreboard')
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def read(self):
+        rows = self._query('SELECT username, score FROM scoreboard ORDER BY score DESC, id')
+        return pd.DataFrame(rows, columns=SCOREBOARD_COLUMNS)
+
+    @timed('save_scoreboard')
+    def write_rows(self, rows):
+        with self._lock, self._conn:
+            self._conn.executemany('INSERT INTO scoreboard (username, score) VALUES (?, ?)', rows)
+
+    def count(self):
+        return self._query('SELECT COUNT(*) FROM scoreboard')[0][0]
+
+    def top(self, n, offset=0):
+        rows = self._query(
+            'SELECT (SELECT COUNT(*) FROM scoreboard AS better WHERE better.score > s.score) + 1, '
+            'username, score FROM scoreboard AS s ORDER BY score DESC, id LIMIT ? OFFSET ?',
+            (n, max(0, offset))
+        )
+        return pd.DataFrame(rows, columns=LEADERBOARD_COLUMNS)
+
+    def around(self, username, window=2):
+        best = self._query(
+            'SELECT id, score FROM scoreboard WHERE username = ? ORDER BY score DESC, id LIMIT 1',
+            (username,)
+        )
+        if not best:
+            return pd.DataFrame(columns=LEADERBOARD_COLUMNS)
+        best_id, best_score = best[0]
+        position = self._query(
+            'SELECT COUNT(*) FROM scoreboard WHERE score > ? OR (score = ? AND id < ?)',
+            (best_score, best_score, best_id)
+        )[0][0]
+        start = max(0, position - window)
+        return self.top(position + window + 1 - start, start)
+
+    def rank(self, username):
+        best = self._query('SELECT MAX(score) FROM scoreboard WHERE username = ?', (username,))[0][0]
+        if best is None:
+            return None
+        return self._query('SELECT COUNT(*) FROM scoreboard WHERE score > ?', (best,))[0][0] + 1
+
+    def has_user(self, username):
+        return bool(self._query('SELECT 1 FROM scoreboard WHERE username = ? LIMIT 1', (username,)))
+
+def create_scoreboard_backend():
+    """
+    Create the scoreboard backend selected by the SCOREBOARD_BACKEND environment
+    variable: 'gsheets' (default) or 'sqlite' (stored at SCOREBOARD_DB_PATH).
+    """
+    kind = os.environ.get('SCOREBOARD_BACKEND', 'gsheets')
+    if kind == 'sqlite':
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        default_path = os.path.join(script_dir, '..', 'data', 'scoreboard.db')
+        return SQLiteBackend(os.environ.get('SCOREBOARD_DB_PATH', default_path))
+    if kind == 'gsheets':
+        from utils.gsheets import GSheetsBackend, init_gsheets
+        return GSheetsBackend(init_gsheets())
+    st.error(f"Unknown scoreboard backend '{kind}'.")
+    st.stop()
+
+def append_score(backend, username, score, timeout=5.0):
+    """
+    Append a single (Username, Score) row to the scoreboard.
+    Waits up to timeout seconds for the background writer; the row stays
+    queued and is written later if the backend is slow.
+    Returns True if the row has been written.
+    """
+    done = backend.writer.submit(username, score)
+    if not done.wait(timeout):
+        st.warning("Saving your score is taking longer than usual. It will be added shortly.")
+        return False
+    return True
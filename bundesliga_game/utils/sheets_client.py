@@ -0,0 +1,111 @@
+# utils/sheets_client.py
+
+import random
+import threading
+import time
+
+import gspread
+import requests
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+from requests.adapters import HTTPAdapter
+
+# Requests sent to the Sheets API at the same time by one process
+MAX_CONCURRENT_REQUESTS = 4
+
+# Reads are retried on quota errors and server errors. A write that failed
+# with a server error may still have been applied, so writes are only retried
+# when the API rejected them for quota, to never append a row twice.
+READ_RETRY_STATUSES = {429, 500, 502, 503, 504}
+WRITE_RETRY_STATUSES = {429}
+READ_METHODS = {'get', 'head', 'options'}
+
+class ResilientHTTPClient(HTTPClient):
+    """
+    gspread HTTP client that is safe to share between sessions: it reuses
+    pooled connections, lets at most max_concurrent requests run at once and
+    retries throttled or failed requests with exponential backoff and jitter,
+    honouring Retry-After.
+    """
+
+    max_concurrent = MAX_CONCURRENT_REQUESTS
+    max_retries = 5
+    base_delay = 0.5
+    max_delay = 32.0
+
+    def __init__(self, auth, session=None):
+        super().__init__(auth, session)
+        # One pooled connection per concurrent request
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrent))
+        self.timeout = (5, 30)
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'throttled': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def backoff(self, attempt, response=None):
+        """
+        Seconds to wait before retry number attempt + 1.
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def request(self, method, endpoint, params=None, data=None, json=None, files=None, headers=None):
+        is_read = method.lower() in READ_METHODS
+        retry_statuses = READ_RETRY_STATUSES if is_read else WRITE_RETRY_STATUSES
+        attempt = 0
+        while True:
+            # Sleep outside the semaphore so waiting callers do not hold a slot
+            with self._slots:
+                self._count('requests')
+                try:
+                    return super().request(method, endpoint, params=params, data=data, json=json, files=files, headers=headers)
+                except APIError as e:
+                    status = e.response.status_code
+                    if status == 429:
+                        self._count('throttled')
+                    if status not in retry_statuses or attempt >= self.max_retries:
+                        raise
+                    delay = self.backoff(attempt, e.response)
+                except (requests.ConnectionError, requests.Timeout):
+                    if not is_read or attempt >= self.max_retries:
+                        raise
+                    delay = self.backoff(attempt)
+            self._count('retries')
+            attempt += 1
+            time.sleep(delay)
+
+    def stats(self):
+        """
+        Return the requests sent, retries made and 429 responses seen.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+def create_sheets_client(credentials, session=None):
+    """
+    Authorize a gspread client that sends its requests through ResilientHTTPClient.
+    """
+    return gspread.authorize(credentials, session=session, http_client=ResilientHTTPClient)
+
+_client = None
+_client_lock = threading.Lock()
+
+def shared_sheets_client(make_credentials):
+    """
+    Return the process-wide gspread client, creating it with the credentials
+    from make_credentials() on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = create_sheets_client(make_credentials())
+        return _client
@@ -0,0 +1,77 @@
+# utils/similar_matches.py
+
+import numpy as np
+import pandas as pd
+
+class SimilarMatchIndex:
+    """
+    Nearest-neighbour index over the matches: the numeric feature columns are
+    standardized (missing values become the column mean) into one float32
+    matrix, and queries rank every match by squared Euclidean distance with
+    a single matrix product per batch.
+    """
+
+    def __init__(self, df, columns):
+        self.columns = [column for column in columns if pd.api.types.is_numeric_dtype(df[column])]
+        values = df[self.columns].to_numpy(dtype=np.float64)
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        std[std == 0] = 1.0
+        standardized = np.nan_to_num((values - mean) / std)
+        self.matrix = np.ascontiguousarray(standardized, dtype=np.float32)
+        self.squared_norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+
+    def query(self, rows, k=5):
+        """
+        Get the k matches closest to each given match row, nearest first,
+        leaving out the match itself.
+        Returns an int array of row positions of shape (len(rows), k).
+        """
+        rows = np.atleast_1d(rows)
+        queries = self.matrix[rows]
+        # |x - q|^2 = |x|^2 - 2 x.q + |q|^2; the last term does not change the ranking
+        distances = self.squared_norms[None, :] - 2.0 * (queries @ self.matrix.T)
+        distances[np.arange(len(rows)), rows] = np.inf
+        k = min(k, len(self.matrix) - 1)
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1)
+        return np.take_along_axis(nearest, order, axis=1)
+
+if __name__ == '__main__':
+    # Check the index against a brute-force search and time queries as the
+    # data grows: python -m utils.similar_matches
+    import os
+    import time
+
+    from utils.helpers import RADAR_COLUMNS
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    df = pd.read_csv(os.path.join(script_dir, '..', 'data', 'bundesliga_matches.csv'))
+    columns = list(dict.fromkeys([column for pair in RADAR_COLUMNS.values() for column in pair] + [
+        column for column in df.columns if column.endswith('_last_4_games')
+    ]))
+
+    index = SimilarMatchIndex(df, columns)
+    nearest = index.query(np.arange(len(df)))
+    mismatches = 0
+    for row in range(len(df)):
+        distances = ((index.matrix.astype(np.float64) - index.matrix[row]) ** 2).sum(axis=1)
+        distances[row] = np.inf
+        expected = np.sort(distances)[:nearest.shape[1]]
+        mismatches += not np.allclose(distances[nearest[row]], expected, rtol=1e-4, atol=1e-4)
+    print(f"{len(df)} rows, {len(index.columns)} features: {mismatches} rows differ from a brute-force search.")
+
+    rng = np.random.default_rng(0)
+    for copies in (1, 10, 50):
+        grown = pd.concat([df] * copies, ignore_index=True)
+        start = time.perf_counter()
+        grown_index = SimilarMatchIndex(grown, columns)
+        build_ms = (time.perf_counter() - start) * 1000
+        rows = rng.integers(len(grown), size=200)
+        start = time.perf_counter()
+        for row in rows:
+            grown_index.query(row)
+        query_ms = (time.perf_counter() - start) * 1000 / len(rows)
+        print(f"  {len(grown):>7} matches: built in {build_ms:.1f} ms, {query_ms:.3f} ms per query")
+    if mismatches:
+        raise SystemExit("The index does not match the brute-force search.")
@@ -0,0 +1,232 @@
+# utils/training.py
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.evaluation import file_fingerprint
+from utils.match_store import _write_atomically
+
+# Features of the shipped pipeline; the captain columns in app.py's
+# model_features are not used by it
+NUMERIC_FEATURES = [
+    "team_overall", "team_attack", "team_midfield", "team_defense",
+    "opponent_overall", "opponent_attack", "opponent_midfield", "opponent_defense",
+    "gf_last_4_games", "ga_last_4_games", "xg_last_4_games", "xga_last_4_games",
+    "avg_points_last_4_games", "sh_last_4_games", "sot_last_4_games", "poss_last_4_games",
+    "opponent_gf_last_4_games", "opponent_ga_last_4_games", "opponent_xga_last_4_games",
+    "opponent_avg_points_last_4_games", "team_salary", "opponent_team_salary", "hour",
+]
+CATEGORICAL_FEATURES = ["venue", "day", "home_team_formation", "away_team_formation", "referee"]
+
+# Hyperparameters searched, every combination is one candidate
+PARAM_GRID = {
+    'C': [0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0, 3.0],
+    'penalty': ['l1', 'l2'],
+}
+
+# Predicted probabilities are clipped before taking logs
+EPSILON = 1e-15
+
+def build_pipeline(C=0.01, penalty='l2'):
+    """
+    Build an unfitted pipeline with the same steps as best_lr_model.pkl.
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.impute import SimpleImputer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    preprocessor = ColumnTransformer(transformers=[
+        ('num', Pipeline(steps=[
+            ('imputer', SimpleImputer()),
+            ('scaler', StandardScaler()),
+        ]), NUMERIC_FEATURES),
+        ('cat', Pipeline(steps=[
+            ('imputer', SimpleImputer(strategy='most_frequent')),
+            ('encoder', OneHotEncoder(handle_unknown='ignore')),
+        ]), CATEGORICAL_FEATURES),
+    ])
+    classifier = LogisticRegression(C=C, penalty=penalty, solver='liblinear', random_state=1)
+    return Pipeline(steps=[('preprocessor', preprocessor), ('classifier', classifier)])
+
+def _describe(value):
+    """
+    Plain JSON-able description of an estimator parameter; estimators are
+    named by class, their own parameters are listed separately.
+    """
+    if hasattr(value, 'get_params'):
+        return type(value).__name__
+    if isinstance(value, (list, tuple)):
+        return [_describe(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+def preprocessor_fingerprint():
+    """
+    SHA-256 of the feature lists and every preprocessing parameter, so cached
+    fold matrices are not reused after the features or steps change.
+    """
+    params = build_pipeline().named_steps['preprocessor'].get_params(deep=True)
+    description = {
+        'numeric_features': NUMERIC_FEATURES,
+        'categorical_features': CATEGORICAL_FEATURES,
+        'preprocessor': {name: _describe(value) for name, value in params.items()},
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+def season_folds(df):
+    """
+    Time-aware splits: each season after the first is validated on a model
+    trained on all earlier seasons.
+    Returns (validation season, train row positions, validation row positions) tuples.
+    """
+    seasons = np.asarray(df['season'])
+    return [
+        (int(season), np.flatnonzero(seasons < season), np.flatnonzero(seasons == season))
+        for season in np.unique(seasons)[1:]
+    ]
+
+def cache_fold_matrices(df, folds, cache_dir):
+    """
+    Encode and scale every fold once, fitting the preprocessor on the fold's
+    training rows only, and save the matrices as .npy files.
+    Files that already exist are reused. Returns the .npy paths of each fold.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    real_win = (df['result'] == 'W').to_numpy(dtype=np.int8)
+    fold_paths = []
+    for season, train_rows, val_rows in folds:
+        paths = {part: os.path.join(cache_dir, f"fold_{season}_{part}.npy") for part in ('X_train', 'y_train', 'X_val', 'y_val')}
+        if not all(os.path.exists(path) for path in paths.values()):
+            preprocessor = build_pipeline().named_steps['preprocessor']
+            X_train = preprocessor.fit_transform(df.iloc[train_rows])
+            X_val = preprocessor.transform(df.iloc[val_rows])
+            arrays = {
+                'X_train': X_train.toarray() if hasattr(X_train, 'toarray') else X_train,
+                'y_train': real_win[train_rows],
+                'X_val': X_val.toarray() if hasattr(X_val, 'toarray') else X_val,
+                'y_val': real_win[val_rows],
+            }
+            for part, path in paths.items():
+                # Swapped in whole, so a crash or a parallel run never leaves a partial file
+                array = np.ascontiguousarray(arrays[part])
+                _write_atomically(path, lambda f: np.save(f, array, allow_pickle=False))
+        fold_paths.append((season, paths))
+    return fold_paths
+
+def _fit_candidate(params, season, paths):
+    """
+    Fit one candidate on one cached fold and score it on the fold's validation season.
+    Runs in a worker process; the matrices are memory-mapped, not copied.
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    X_train, y_train, X_val, y_val = (np.load(paths[part], mmap_mode='r') for part in ('X_train', 'y_train', 'X_val', 'y_val'))
+    classifier = LogisticRegression(solver='liblinear', random_state=1, **params)
+    classifier.fit(X_train, y_train)
+    p = np.clip(classifier.predict_proba(X_val)[:, list(classifier.classes_).index(1)], EPSILON, 1 - EPSILON)
+    return {
+        'season': season,
+        'accuracy': float(np.mean((p > 0.5) == y_val)),
+        'log_loss': float(-np.mean(y_val * np.log(p) + (1 - y_val) * np.log(1 - p))),
+    }
+
+def search(fold_paths, param_grid=PARAM_GRID, workers=None):
+    """
+    Score every candidate on every fold across a process pool.
+    Returns one result per candidate with its per-fold and mean metrics,
+    best (lowest mean log loss) first.
+    """
+    names = sorted(param_grid)
+    candidates = [dict(zip(names, values)) for values in itertools.product(*(param_grid[name] for name in names))]
+    tasks = [(params, season, paths) for params in candidates for season, paths in fold_paths]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_fit_candidate, *task) for task in tasks]
+        scores = [future.result() for future in futures]
+
+    results = []
+    for i, params in enumerate(candidates):
+        folds = scores[i * len(fold_paths):(i + 1) * len(fold_paths)]
+        results.append({
+            'params': params,
+            'mean_log_loss': round(float(np.mean([fold['log_loss'] for fold in folds])), 4),
+            'mean_accuracy': round(float(np.mean([fold['accuracy'] for fold in folds])), 4),
+            'folds': folds,
+        })
+    return sorted(results, key=lambda result: result['mean_log_loss'])
+
+def train(data_path, model_path, report_path, cache_dir, workers=None):
+    """
+    Run the season-based search, refit the best candidate on every match
+    and write the pickled pipeline and a metrics report.
+    """
+    import joblib
+
+    start = time.perf_counter()
+    df = pd.read_csv(data_path)
+    folds = season_folds(df)
+    # The cache is keyed by the data it was encoded from and how it was encoded
+    cache_key = f"{file_fingerprint(data_path)[:16]}_{preprocessor_fingerprint()[:16]}"
+    fold_paths = cache_fold_matrices(df, folds, os.path.join(cache_dir, cache_key))
+    cached = time.perf_counter()
+
+    results = search(fold_paths, workers=workers)
+    searched = time.perf_counter()
+
+    best = results[0]
+    pipeline = build_pipeline(**best['params'])
+    # Integer labels, like the shipped pipeline's classes_ of [0, 1]
+    pipeline.fit(df[NUMERIC_FEATURES + CATEGORICAL_FEATURES], (df['result'] == 'W').astype(int))
+    joblib.dump(pipeline, model_path)
+
+    report = {
+        'best_params': best['params'],
+        'best_mean_log_loss': best['mean_log_loss'],
+        'best_mean_accuracy': best['mean_accuracy'],
+        'validation_seasons': [season for season, _, _ in folds],
+        'workers': workers or os.cpu_count(),
+        'timings_s': {
+            'encode_folds': round(cached - start, 3),
+            'search': round(searched - cached, 3),
+            'refit': round(time.perf_counter() - searched, 3),
+        },
+        'data_sha256': file_fingerprint(data_path),
+        'candidates': results,
+    }
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    return report
+
+if __name__ == '__main__':
+    # Retrain the model: python -m utils.training [--workers N]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Retrain the match prediction model with a season-based search.")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(script_dir, '..', 'data')
+    report = train(
+        os.path.join(data_dir, 'bundesliga_matches.csv'),
+        os.path.join(data_dir, 'retrained_lr_model.pkl'),
+        os.path.join(data_dir, 'training_report.json'),
+        os.path.join(data_dir, 'training_cache'),
+        workers=args.workers,
+    )
+    timings = report['timings_s']
+    print(f"Searched {len(report['candidates'])} candidates on seasons {report['validation_seasons']} "
+          f"with {report['workers']} workers in {timings['search']}s (encoding {timings['encode_folds']}s).")
+    print(f"Best {report['best_params']}: mean log loss {report['best_mean_log_loss']}, "
+          f"mean accuracy {report['best_mean_accuracy']}")
+    print("Wrote data/retrained_lr_model.pkl and data/training_report.json")